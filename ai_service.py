@@ -132,8 +132,8 @@ class AIService:
                 self.progress_callback(f"Error loading local model: {str(e)}", 0)
             raise
             
-    def _get_file_info(self, file_path: str) -> Tuple[str, str]:
-        """Get file information and sample content for analysis."""
+    def get_file_info(self, file_path: str) -> Tuple[str, str]:
+        """Get file information and sample content for analysis, and the file's hash."""
         if self.progress_callback:
             self.progress_callback("Starting file analysis...", 0)
 
@@ -215,13 +215,36 @@ class AIService:
         Returns ([(existing_tag, confidence)], [(new_tag, confidence)], explanation_text)
         """
         # Check cache first
-        file_info, file_hash = self._get_file_info(file_path)
-        cached = self._check_cache(file_path, file_hash)
+        file_info, file_hash = self.get_file_info(file_path)
+        cached = self.get_cached_suggestions(file_path, file_hash)
         if cached:
             if self.progress_callback:
                 self.progress_callback("Using cached results", 100)
+            return cached
+
+        result = self.analyze_file_info(file_info, existing_tags)
+
+        # Cache the results
+        if self.progress_callback:
+            self.progress_callback("Caching results...", 95)
+        self.cache_suggestions(file_path, file_hash, result)
+
+        if self.progress_callback:
+            self.progress_callback("Analysis complete", 100)
+        return result
+
+    def get_cached_suggestions(self, file_path: str, file_hash: str) -> Optional[Tuple[List[Tuple[str, float]], List[Tuple[str, float]], str]]:
+        """Return still valid cached suggestions for a file, or None."""
+        cached = self._check_cache(file_path, file_hash)
+        if cached:
             return self._parse_cached_suggestions(cached)
-            
+        return None
+
+    def analyze_file_info(self, file_info: str, existing_tags: List[str]) -> Tuple[List[Tuple[str, float]], List[Tuple[str, float]], str]:
+        """
+        Ask the AI provider for tags for information from get_file_info.
+        Does not use the database, so it can run on any thread.
+        """
         if self.progress_callback:
             self.progress_callback("Preparing AI analysis...", 85)
 
@@ -251,14 +274,6 @@ class AIService:
             result = self._analyze_local(prompt, existing_tags)
         else:
             raise ValueError(f"Unsupported provider: {self.provider}")
-            
-        # Cache the results
-        if self.progress_callback:
-            self.progress_callback("Caching results...", 95)
-        self._cache_suggestions(file_path, file_hash, result)
-
-        if self.progress_callback:
-            self.progress_callback("Analysis complete", 100)
         return result
             
     def _analyze_openai(self, prompt: str, existing_tags: List[str]) -> Tuple[List[Tuple[str, float]], List[Tuple[str, float]], str]:
@@ -407,8 +422,8 @@ class AIService:
             
         return None
         
-    def _cache_suggestions(self, file_path: str, file_hash: str, 
-                         suggestions: Tuple[List[Tuple[str, float]], List[Tuple[str, float]], str]):
+    def cache_suggestions(self, file_path: str, file_hash: str, 
+                        suggestions: Tuple[List[Tuple[str, float]], List[Tuple[str, float]], str]):
         """Cache tag suggestions for a file."""
         existing_tags, new_tags, explanation = suggestions
         cache_data = {
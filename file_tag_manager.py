@@ -1,7 +1,11 @@
 import os
+import queue
+import stat
 import sys
 import logging
 import traceback
+from collections import OrderedDict
+from functools import partial
 from PySide6.QtWidgets import (
     QMainWindow,
     QWidget,
@@ -9,6 +13,7 @@ from PySide6.QtWidgets import (
     QHBoxLayout,
     QTreeView,
     QListWidget,
+    QListView,
     QPushButton,
     QInputDialog,
     QColorDialog,
@@ -33,7 +38,7 @@ from PySide6.QtWidgets import (
     QApplication,
     QStyle,
 )
-from PySide6.QtCore import Qt, QDir, QStorageInfo
+from PySide6.QtCore import Qt, QDir, QStorageInfo, QThread, Signal
 from PySide6.QtGui import (
     QColor,
     QFont,
@@ -41,17 +46,52 @@ from PySide6.QtGui import (
     QTextDocument,
     QAction,
     QActionGroup,
+    QStandardItem,
+    QStandardItemModel,
 )
 from PySide6.QtCore import QUrl, QSize
-from sqlalchemy import and_, or_
-from models import File, Tag
+from sqlalchemy import and_, or_, func
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import joinedload, selectinload
+from models import File, Tag, file_tags, SessionLocal
 from config import Config
 from vector_search import VectorSearch
+from vector_search.content_extractor import ContentExtractor
 from api_settings import APISettingsDialog
 from password_management import PasswordManagementDialog
-from tag_suggestion import TagSuggestionDialog
+from tag_suggestion import TagSuggestionDialog, TagSuggester
 from search import ChatWithResultsDialog
-from utils import is_dark_color, get_score_color, open_file, open_containing_folder
+from utils import (
+    get_tag_colors,
+    get_score_color,
+    random_tag_color,
+    open_file,
+    open_containing_folder,
+    existing_paths,
+)
+
+# Up to this many tags, AND searches intersect per-tag file id sets in Python;
+# beyond it a single GROUP BY/HAVING query is used
+AND_SEARCH_INTERSECT_LIMIT = 4
+
+# Paths per "path IN (...)" query, kept under SQLite's bound-parameter limit
+PATH_QUERY_BATCH_SIZE = 500
+
+# Prefix for snippet rows in the content search results
+SNIPPET_PREFIX = "    ↪ "
+
+# Shared default for result fields that may be missing
+_EMPTY = ()
+
+# Maximum number of documents that can be checked for a chat
+MAX_CHAT_DOCUMENTS = 3
+
+# Number of top content results whose text is loaded ahead of a chat, and
+# the number of extracted documents kept for reuse
+CHAT_PREFETCH_COUNT = 5
+CHAT_CONTEXT_CACHE_SIZE = 16
+# Files analysed at once when scanning a folder for untagged files
+SCAN_MAX_WORKERS = min(8, os.cpu_count() or 1)
 
 
 class HTMLDelegate(QStyledItemDelegate):
@@ -123,6 +163,270 @@ class HTMLDelegate(QStyledItemDelegate):
         return super().sizeHint(option, index)
 
 
+class DriveProbeThread(QThread):
+    """Thread to enumerate mounted drives without blocking the UI."""
+
+    drives_found = Signal(list)  # list of (display name, root path) tuples
+
+    def run(self):
+        drives = []
+        for drive in QStorageInfo.mountedVolumes():
+            if not drive.isValid() or not drive.isReady():
+                continue
+            drives.append((drive.displayName(), drive.rootPath()))
+        self.drives_found.emit(drives)
+
+
+class VectorSearchThread(QThread):
+    """Thread to run a semantic search without blocking the UI."""
+
+    search_finished = Signal(list)  # list of result dictionaries
+    search_error = Signal(str)  # error message
+
+    def __init__(self, vector_search, query, tag_filter, use_and, limit=20):
+        super().__init__()
+        self.vector_search = vector_search
+        self.query = query
+        self.tag_filter = tag_filter
+        self.use_and = use_and
+        self.limit = limit
+
+    def run(self):
+        try:
+            results = self.vector_search.search(
+                self.query,
+                tag_filter=self.tag_filter,
+                use_and=self.use_and,
+                limit=self.limit,
+            )
+            self.search_finished.emit(results or [])
+        except Exception as e:
+            self.search_error.emit(str(e))
+
+
+class VectorRemoveThread(QThread):
+    """Thread to remove a file from the search index without blocking the UI."""
+
+    remove_finished = Signal(bool)  # whether the index removal succeeded
+
+    def __init__(self, vector_search, file_path):
+        super().__init__()
+        self.vector_search = vector_search
+        self.file_path = file_path
+
+    def run(self):
+        try:
+            success = bool(self.vector_search.remove_file(self.file_path))
+        except Exception as e:
+            print(f"Error removing file from search index: {str(e)}")
+            success = False
+        self.remove_finished.emit(success)
+
+
+class ChatContextPrefetchThread(QThread):
+    """Thread to extract result documents before the user opens a chat."""
+
+    content_ready = Signal(str, float, str)  # path, modification time, content
+
+    def __init__(self, vector_search, file_paths, pdf_extractor):
+        super().__init__()
+        self.vector_search = vector_search
+        self.file_paths = file_paths
+        self.pdf_extractor = pdf_extractor
+
+    def run(self):
+        # The window's session belongs to the GUI thread, so use a separate one;
+        # going through the content cache usually avoids extracting at all
+        db_session = SessionLocal()
+        vector_search = self.vector_search.with_session(db_session)
+        try:
+            for file_path in self.file_paths:
+                try:
+                    mtime = os.path.getmtime(file_path)
+                    content = vector_search.extract_content(
+                        file_path, self.pdf_extractor
+                    )
+                    db_session.commit()  # Keep the extracted content cached
+                except Exception as e:
+                    db_session.rollback()
+                    print(f"Error prefetching {file_path}: {str(e)}")
+                    continue
+                if content:
+                    self.content_ready.emit(file_path, mtime, content)
+        finally:
+            db_session.close()
+
+
+class ReindexThread(QThread):
+    """Thread to rebuild the search index without blocking the UI."""
+
+    reindex_progress = Signal(str, int)  # message, percent complete
+    reindex_finished = Signal()
+    reindex_error = Signal(str)  # error message
+
+    def __init__(self, vector_search):
+        super().__init__()
+        self.vector_search = vector_search
+        self.stop_requested = False
+
+    def stop(self):
+        self.stop_requested = True
+
+    def run(self):
+        # The window's session belongs to the GUI thread, so use a separate one
+        db_session = SessionLocal()
+        vector_search = self.vector_search.with_session(db_session)
+        error = None
+        try:
+            vector_search.reindex_all(
+                progress_callback=self.reindex_progress.emit,
+                should_stop=lambda: self.stop_requested,
+            )
+        except Exception as e:
+            db_session.rollback()
+            error = str(e)
+        finally:
+            db_session.close()
+
+        # Hand the recreated collection back to the window's instance before
+        # reporting, so index updates held back meanwhile go to the new one
+        self.vector_search.collection = vector_search.collection
+        if error is None:
+            self.reindex_finished.emit()
+        else:
+            self.reindex_error.emit(error)
+
+
+class ForceReindexThread(QThread):
+    """Thread to re-extract and reindex a single file without blocking the UI."""
+
+    reindex_progress = Signal(str)  # progress message
+    reindex_finished = Signal(bool, str)  # success, error message
+
+    def __init__(self, vector_search, file_path, pdf_extractor):
+        super().__init__()
+        self.vector_search = vector_search
+        self.file_path = file_path
+        self.pdf_extractor = pdf_extractor
+
+    def run(self):
+        file_name = os.path.basename(self.file_path)
+
+        # Extract afresh rather than through the content cache; forcing a
+        # reindex usually means the stored content is suspect
+        self.reindex_progress.emit(f"Extracting content from {file_name}...")
+        content = ContentExtractor.extract_file_content(
+            self.file_path, pdf_extractor=self.pdf_extractor
+        )
+        if not content:
+            self.reindex_finished.emit(
+                False,
+                f"Could not extract content from {file_name}.\n\n"
+                "This file type may not be supported for content extraction.",
+            )
+            return
+        print(f"Content extracted, length: {len(content)} characters")
+
+        self.reindex_progress.emit("Summarizing and indexing content...")
+        # The window's session belongs to the GUI thread, so use a separate one
+        db_session = SessionLocal()
+        vector_search = self.vector_search.with_session(db_session)
+        try:
+            # Remove existing entries before reindexing
+            print(f"Removing existing document entries for: {self.file_path}")
+            vector_search.remove_file(self.file_path)
+
+            # Index the file with extracted content
+            print(f"Reindexing file: {self.file_path}")
+            vector_search.index_file(self.file_path, content)
+            db_session.commit()
+        except Exception as e:
+            db_session.rollback()
+            print(f"Error during finishing reindexing: {str(e)}")
+            self.reindex_finished.emit(
+                False, f"Failed to complete reindexing: {str(e)}"
+            )
+            return
+        finally:
+            db_session.close()
+
+        # Verify that the file was indexed with a summary
+        try:
+            results = vector_search.collection.get(
+                ids=[self.file_path], include=["metadatas"]
+            )
+            if results and results["ids"]:
+                metadata = results["metadatas"][0]
+                print("Verification successful - file found in vector store")
+                if metadata.get("summary"):
+                    print(f"Document summary generated: {metadata['summary']}")
+                else:
+                    print("No document summary was generated")
+        except Exception as verify_err:
+            print(f"Error verifying file in vector store: {str(verify_err)}")
+
+        self.reindex_finished.emit(True, "")
+
+
+class VectorIndexThread(QThread):
+    """Thread that brings the search index up to date for newly tagged files."""
+
+    index_progress = Signal(str)  # status message
+
+    def __init__(self, vector_search):
+        super().__init__()
+        self.vector_search = vector_search
+        self.jobs = queue.Queue()
+        self.stop_requested = False
+
+    def enqueue(self, file_path, newly_tagged, pdf_extractor):
+        self.jobs.put((file_path, newly_tagged, pdf_extractor))
+
+    def stop(self):
+        # Pending jobs are dropped; the running one is allowed to finish
+        self.stop_requested = True
+        self.jobs.put(None)
+
+    def run(self):
+        # The window's session belongs to the GUI thread, so use a separate one
+        db_session = SessionLocal()
+        try:
+            while True:
+                job = self.jobs.get()
+                if job is None or self.stop_requested:
+                    break
+
+                file_path, newly_tagged, pdf_extractor = job
+                self.index_progress.emit(
+                    f"Updating search index: {os.path.basename(file_path)}"
+                )
+                # Copy per job so a full reindex's new collection is picked up
+                vector_search = self.vector_search.with_session(db_session)
+                try:
+                    if newly_tagged:
+                        content = vector_search.extract_content(
+                            file_path, pdf_extractor
+                        )
+                        # Commit the cached content straight away; holding the
+                        # write lock through summarizing would block the UI
+                        db_session.commit()
+                        if content:
+                            vector_search.index_file(file_path, content)
+                        else:
+                            print(f"No content could be extracted from: {file_path}")
+                    else:
+                        vector_search.update_metadata(file_path)
+                    db_session.commit()
+                except Exception as e:
+                    db_session.rollback()
+                    print(f"Error updating search index for {file_path}: {str(e)}")
+
+                if self.jobs.empty():
+                    self.index_progress.emit("Search index up to date")
+        finally:
+            db_session.close()
+
+
 class AboutDialog(QDialog):
     """Dialog showing information about the application."""
 
@@ -227,20 +531,43 @@ class FileTagManager(QMainWindow):
 
                 self.current_file_path = None
                 self.current_search_results = []  # Initialize search results storage
+                # Plain (id, name, color) tag rows keyed by name, rebuilt in
+                # refresh_tags; unlike ORM objects they are not expired by commits
+                self._tags_by_name = {}
+                # Single tag model shared by every tag list view
+                self.tag_model = QStandardItemModel(self)
+                # Placeholder widgets of tabs not built yet -> builder functions
+                self._lazy_tab_factories = {}
+                # Tag search result path -> list item
+                self._tag_result_items = {}
+                # Content search result path -> (first row, row count)
+                self._rag_result_index = {}
+                self._drive_index = {}  # Normalized drive root path -> combo index
+                # Bumped per content search; results from older searches are dropped
+                self._search_epoch = 0
+                # Checked content results, path -> result, in the order checked
+                self._checked_results = {}
+                # (path, modification time, PDF extractor) -> extracted text for
+                # the chat dialog
+                self._chat_ctx_cache = OrderedDict()
+                self._about_dialog = None  # Built on first Help > About
+                self._index_thread = None  # Started on first queued index update
+                # Index updates held back while Reindex All runs, or None
+                self._deferred_index_updates = None
 
                 self.logger.debug("About to call init_ui")
                 self.init_ui()
                 self.logger.debug("init_ui completed successfully")
             except Exception as e:
-                self.logger.error(
-                    f"Error during FileTagManager initialization: {str(e)}"
+                self.logger.exception(
+                    "Error during FileTagManager initialization: %s", e
                 )
-                self.logger.error(traceback.format_exc())
                 raise
 
         except Exception as e:
-            self.logger.critical(f"Fatal error in FileTagManager constructor: {str(e)}")
-            self.logger.critical(traceback.format_exc())
+            self.logger.critical(
+                "Fatal error in FileTagManager constructor: %s", e, exc_info=True
+            )
             # Show error dialog since this is a critical failure
             QMessageBox.critical(
                 None,
@@ -261,8 +588,15 @@ class FileTagManager(QMainWindow):
         self.logger.debug(
             f"Main window close event received, reason: {event.spontaneous()}"
         )
-        self.logger.debug("Stack trace at close event:")
-        self.logger.debug("".join(traceback.format_stack()))
+        # Formatting the stack is only worth it when debug output is kept
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("Stack trace at close event:")
+            self.logger.debug("".join(traceback.format_stack()))
+
+        # Let a running index update finish, but drop any still queued
+        if self._index_thread is not None:
+            self._index_thread.stop()
+            self._index_thread.wait()
 
         # Call parent class method to proceed with normal closing
         super().closeEvent(event)
@@ -280,6 +614,13 @@ class FileTagManager(QMainWindow):
             self.setup_menus()
             self.logger.debug("Menus set up successfully")
 
+            # Create the search result context menu once and reuse it
+            self._result_menu = QMenu(self)
+            self._act_open = self._result_menu.addAction("Open File")
+            self._act_folder = self._result_menu.addAction("Open Containing Folder")
+            self._act_reindex = self._result_menu.addAction("Force Reindex")
+            self._act_remove = self._result_menu.addAction("Remove from Search Index")
+
             # Create central widget and main layout
             self.logger.debug("Creating central widget")
             central_widget = QWidget()
@@ -290,6 +631,9 @@ class FileTagManager(QMainWindow):
             # Create the main tab widget
             self.logger.debug("Creating main tabs")
             self.main_tabs = QTabWidget()
+            self.main_tabs.currentChanged.connect(
+                lambda index: self.build_lazy_tab(self.main_tabs, index)
+            )
             main_layout.addWidget(self.main_tabs)
             self.logger.debug("Main tabs created")
 
@@ -298,9 +642,8 @@ class FileTagManager(QMainWindow):
             tagging_tab = self.create_tagging_tab()
             self.logger.debug("Tagging tab created")
 
-            self.logger.debug("Creating search tab")
-            search_tab = self.create_search_tab()
-            self.logger.debug("Search tab created")
+            # The search tab is only built when it is first opened
+            search_tab = self.create_lazy_tab(self.create_search_tab)
 
             self.main_tabs.addTab(tagging_tab, "Tagging Interface")
             self.main_tabs.addTab(search_tab, "Search Interface")
@@ -318,24 +661,17 @@ class FileTagManager(QMainWindow):
                 self.path_display.setText(initial_path)
                 self.logger.debug("Updated path display")
             except Exception as e:
-                self.logger.error(f"Error setting initial directory: {str(e)}")
-                self.logger.error(traceback.format_exc())
+                self.logger.exception("Error setting initial directory: %s", e)
                 raise
 
-            # Update drive list and select current drive
+            # Probe drives in the background; the current drive is
+            # selected once the list arrives
             self.logger.debug("Updating drive list")
             try:
                 self.update_drive_list()
-                self.logger.debug("Drive list updated")
-                drive = os.path.splitdrive(initial_path)[0] + os.path.sep
-                for i in range(self.drive_combo.count()):
-                    if self.drive_combo.itemData(i).startswith(drive):
-                        self.drive_combo.setCurrentIndex(i)
-                        break
-                self.logger.debug(f"Selected drive in combo box: {drive}")
+                self.logger.debug("Drive probe started")
             except Exception as e:
-                self.logger.error(f"Error updating drive list: {str(e)}")
-                self.logger.error(traceback.format_exc())
+                self.logger.exception("Error updating drive list: %s", e)
                 raise
 
             # Connect signals after initialization
@@ -346,16 +682,14 @@ class FileTagManager(QMainWindow):
                 self.refresh_tags()
                 self.logger.debug("Tags refreshed")
             except Exception as e:
-                self.logger.error(
-                    f"Error connecting signals or refreshing tags: {str(e)}"
+                self.logger.exception(
+                    "Error connecting signals or refreshing tags: %s", e
                 )
-                self.logger.error(traceback.format_exc())
                 raise
 
             self.logger.debug("init_ui completed successfully")
         except Exception as e:
-            self.logger.error(f"Error in init_ui: {str(e)}")
-            self.logger.error(traceback.format_exc())
+            self.logger.exception("Error in init_ui: %s", e)
             raise
 
     def setup_menus(self):
@@ -413,8 +747,10 @@ class FileTagManager(QMainWindow):
 
     def show_about_dialog(self):
         """Show the About dialog."""
-        dialog = AboutDialog(self)
-        dialog.exec()
+        # The contents never change, so build the dialog once and reuse it
+        if self._about_dialog is None:
+            self._about_dialog = AboutDialog(self)
+        self._about_dialog.exec()
 
     def create_tagging_tab(self):
         """Create and return the tagging interface tab."""
@@ -443,18 +779,38 @@ class FileTagManager(QMainWindow):
         layout = QVBoxLayout(tab)
 
         # Create tab widget for different search types
-        search_tabs = QTabWidget()
+        self.search_tabs = QTabWidget()
+        self.search_tabs.currentChanged.connect(
+            lambda index: self.build_lazy_tab(self.search_tabs, index)
+        )
 
-        # Create and add tag search and RAG search tabs
+        # Create and add tag search and RAG search tabs; the RAG tab is
+        # built when it is first selected
         tag_search_tab = self.create_tag_search_tab()
-        rag_search_tab = self.create_rag_search_tab()
+        rag_search_tab = self.create_lazy_tab(self.create_rag_search_tab)
 
-        search_tabs.addTab(tag_search_tab, "Tag Search")
-        search_tabs.addTab(rag_search_tab, "Content Search")
+        self.search_tabs.addTab(tag_search_tab, "Tag Search")
+        self.search_tabs.addTab(rag_search_tab, "Content Search")
 
-        layout.addWidget(search_tabs)
+        layout.addWidget(self.search_tabs)
         return tab
 
+    def create_lazy_tab(self, factory):
+        """Return a placeholder tab whose contents are built on first display."""
+        placeholder = QWidget()
+        layout = QVBoxLayout(placeholder)
+        layout.setContentsMargins(0, 0, 0, 0)
+        self._lazy_tab_factories[placeholder] = factory
+        return placeholder
+
+    def build_lazy_tab(self, tab_widget, index):
+        """Build the contents of a lazily created tab when it becomes current."""
+        placeholder = tab_widget.widget(index)
+        factory = self._lazy_tab_factories.pop(placeholder, None)
+        if factory is not None:
+            self.logger.debug(f"Building tab: {tab_widget.tabText(index)}")
+            placeholder.layout().addWidget(factory())
+
     def create_file_explorer_section(self):
         """Create and return the file explorer section layout."""
         explorer_layout = QVBoxLayout()
@@ -479,15 +835,23 @@ class FileTagManager(QMainWindow):
 
         explorer_layout.addLayout(nav_layout)
 
-        # File system model and view
+        # File system model and view. Root the model at the home directory
+        # rather than the filesystem root so it doesn't index every drive,
+        # and skip symlinks to avoid following link loops.
         self.model = QFileSystemModel()
-        self.model.setRootPath("")
+        self.model.setFilter(QDir.AllEntries | QDir.NoDotAndDotDot | QDir.NoSymLinks)
 
         self.tree = QTreeView()
         self.tree.setModel(self.model)
+        # Start gathering directory contents only once the view is attached
+        self.model.setRootPath(self.config.get_home_directory())
         self.tree.setSortingEnabled(True)
         self.tree.header().setSortIndicator(0, Qt.SortOrder.AscendingOrder)
         self.tree.header().setSectionsClickable(True)
+        # All rows are single-line, so skip measuring each one during layout
+        self.tree.setUniformRowHeights(True)
+        # Double-clicking a folder navigates into it instead of expanding it
+        self.tree.setExpandsOnDoubleClick(False)
 
         # Configure column resizing
         self.tree.header().setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
@@ -510,8 +874,7 @@ class FileTagManager(QMainWindow):
         tag_layout = QVBoxLayout()
         tag_layout.addWidget(QLabel("Tags"))
 
-        self.tag_list = QListWidget()
-        self.tag_list.setSelectionMode(QListWidget.SelectionMode.ExtendedSelection)
+        self.tag_list = self.create_tag_view(QListView.SelectionMode.ExtendedSelection)
         tag_layout.addWidget(self.tag_list)
 
         tag_buttons = QHBoxLayout()
@@ -564,9 +927,8 @@ class FileTagManager(QMainWindow):
         tag_select_layout = QVBoxLayout()
         tag_select_layout.addWidget(QLabel("Select Tags to Search:"))
 
-        self.search_tag_list = QListWidget()
-        self.search_tag_list.setSelectionMode(
-            QListWidget.SelectionMode.ExtendedSelection
+        self.search_tag_list = self.create_tag_view(
+            QListView.SelectionMode.ExtendedSelection
         )
         tag_select_layout.addWidget(self.search_tag_list)
 
@@ -593,7 +955,7 @@ class FileTagManager(QMainWindow):
         )
         self.search_results.setContextMenuPolicy(Qt.CustomContextMenu)
         self.search_results.customContextMenuRequested.connect(
-            self.on_search_result_right_clicked
+            partial(self.on_search_result_right_clicked, self.search_results)
         )
         results_layout.addWidget(self.search_results)
 
@@ -618,9 +980,9 @@ class FileTagManager(QMainWindow):
         self.query_input.setPlaceholderText("Enter your search query...")
         query_layout.addWidget(self.query_input)
 
-        search_btn = QPushButton("Search")
-        search_btn.clicked.connect(self.search_by_content)
-        query_layout.addWidget(search_btn)
+        self.search_btn = QPushButton("Search")
+        self.search_btn.clicked.connect(self.search_by_content)
+        query_layout.addWidget(self.search_btn)
 
         layout.addLayout(query_layout)
 
@@ -636,8 +998,9 @@ class FileTagManager(QMainWindow):
         filter_controls.addWidget(self.rag_or_radio)
         filter_layout.addLayout(filter_controls)
 
-        self.tag_filter_list = QListWidget()
-        self.tag_filter_list.setSelectionMode(QListWidget.SelectionMode.MultiSelection)
+        self.tag_filter_list = self.create_tag_view(
+            QListView.SelectionMode.MultiSelection
+        )
         filter_layout.addWidget(self.tag_filter_list)
 
         layout.addLayout(filter_layout)
@@ -650,9 +1013,10 @@ class FileTagManager(QMainWindow):
         self.rag_search_results.itemDoubleClicked.connect(
             self.on_search_result_double_clicked
         )
+        self.rag_search_results.itemChanged.connect(self.on_rag_result_changed)
         self.rag_search_results.setContextMenuPolicy(Qt.CustomContextMenu)
         self.rag_search_results.customContextMenuRequested.connect(
-            self.on_search_result_right_clicked
+            partial(self.on_search_result_right_clicked, self.rag_search_results)
         )
         results_layout.addWidget(self.rag_search_results)
 
@@ -680,25 +1044,65 @@ class FileTagManager(QMainWindow):
 
         return tab
 
+    def create_tag_view(self, selection_mode):
+        """Create a read-only list view backed by the shared tag model."""
+        view = QListView()
+        view.setModel(self.tag_model)
+        view.setSelectionMode(selection_mode)
+        view.setEditTriggers(QListView.EditTrigger.NoEditTriggers)
+        return view
+
+    def selected_tag_names(self, view):
+        """Return the names of the tags selected in a tag view, in list order."""
+        indexes = sorted(view.selectionModel().selectedIndexes(), key=lambda i: i.row())
+        return [index.data() for index in indexes]
+
     def update_drive_list(self):
-        """Update the list of available drives in the combo box."""
-        self.drive_combo.clear()
-        for drive in QStorageInfo.mountedVolumes():
-            if not drive.isValid() or not drive.isReady():
-                continue
-            name = drive.displayName()
-            root_path = drive.rootPath()
-            self.drive_combo.addItem(f"{name} ({root_path})", root_path)
+        """Update the list of available drives in the combo box.
+
+        Mounted volumes are probed on a background thread, since checking
+        removable or network drives can block.
+        """
+        self.drive_probe_thread = DriveProbeThread(self)
+        self.drive_probe_thread.drives_found.connect(self.populate_drive_list)
+        self.drive_probe_thread.start()
+
+    def populate_drive_list(self, drives):
+        """Fill the drive combo box and select the drive of the current path."""
+        # Block signals so repopulating doesn't navigate the tree view
+        self.drive_combo.blockSignals(True)
+        try:
+            self.drive_combo.clear()
+            self._drive_index = {}
+            items = []
+            for index, (name, root_path) in enumerate(drives):
+                item = QStandardItem(f"{name} ({root_path})")
+                item.setData(root_path, Qt.UserRole)
+                items.append(item)
+                self._drive_index[os.path.normpath(root_path)] = index
+            # The combo's default model is a QStandardItemModel; insert all rows at once
+            self.drive_combo.model().invisibleRootItem().appendRows(items)
+
+            drive = self._select_drive_for_path(self.path_display.text())
+            self.logger.debug(f"Drive list updated, selected drive: {drive}")
+        finally:
+            self.drive_combo.blockSignals(False)
+
+    def _select_drive_for_path(self, path):
+        """Select the drive containing path in the drive combo box and return it."""
+        drive = os.path.splitdrive(path)[0] + os.path.sep
+        idx = self._drive_index.get(os.path.normpath(drive))
+        if idx is not None:
+            self.drive_combo.setCurrentIndex(idx)
+        return drive
 
     def on_drive_changed(self, index):
         """Handle drive selection changes."""
         if index >= 0:
             drive_path = self.drive_combo.itemData(index)
             model_index = self.model.index(drive_path)
+            # The model keeps the header's sort order for newly loaded folders
             self.tree.setRootIndex(model_index)
-            current_column = self.tree.header().sortIndicatorSection()
-            current_order = self.tree.header().sortIndicatorOrder()
-            self.tree.sortByColumn(current_column, current_order)
             self.path_display.setText(drive_path)
 
     def go_home(self):
@@ -706,11 +1110,7 @@ class FileTagManager(QMainWindow):
         home_path = self.config.get_home_directory()
         self.tree.setRootIndex(self.model.index(home_path))
         self.path_display.setText(home_path)
-        home_drive = os.path.splitdrive(home_path)[0] + os.path.sep
-        for i in range(self.drive_combo.count()):
-            if self.drive_combo.itemData(i).startswith(home_drive):
-                self.drive_combo.setCurrentIndex(i)
-                break
+        self._select_drive_for_path(home_path)
 
     def go_up(self):
         """Navigate to the parent directory."""
@@ -724,32 +1124,33 @@ class FileTagManager(QMainWindow):
 
     def refresh_tags(self):
         """Update all tag lists in the UI."""
-        self.tag_list.clear()
-        self.tag_filter_list.clear()
-        self.search_tag_list.clear()
-
-        tags = self.db_session.query(Tag).all()
+        # All tag views share this model, so one pass updates every list
+        self.tag_model.clear()
+
+        # Read-only; don't flush pending changes just to list tags
+        with self.db_session.no_autoflush:
+            tags = self.db_session.query(Tag.id, Tag.name, Tag.color).all()
+        self._tags_by_name = {tag.name: tag for tag in tags}
+        items = []
         for tag in tags:
-            tag_color = QColor(tag.color)
-            text_color = Qt.white if is_dark_color(tag_color) else Qt.black
+            tag_color, text_color = get_tag_colors(tag.color)
 
-            # Add to main tag list
-            self.tag_list.addItem(tag.name)
-            item = self.tag_list.item(self.tag_list.count() - 1)
+            item = QStandardItem(tag.name)
             item.setBackground(tag_color)
             item.setForeground(text_color)
+            items.append(item)
 
-            # Add to filter list
-            self.tag_filter_list.addItem(tag.name)
-            item = self.tag_filter_list.item(self.tag_filter_list.count() - 1)
-            item.setBackground(tag_color)
-            item.setForeground(text_color)
+        # Insert every row at once so the views see a single rows-inserted signal
+        self.tag_model.invisibleRootItem().appendRows(items)
 
-            # Add to search tag list
-            self.search_tag_list.addItem(tag.name)
-            item = self.search_tag_list.item(self.search_tag_list.count() - 1)
-            item.setBackground(tag_color)
-            item.setForeground(text_color)
+    def refresh_tag_views(self):
+        """Refresh the tag lists and the current file's tags in a single repaint."""
+        self.setUpdatesEnabled(False)
+        try:
+            self.refresh_tags()
+            self.refresh_file_tags()
+        finally:
+            self.setUpdatesEnabled(True)
 
     def refresh_file_tags(self):
         """Update the file tags list for the currently selected file."""
@@ -757,18 +1158,44 @@ class FileTagManager(QMainWindow):
         if not self.current_file_path:
             return
 
-        file_obj = (
-            self.db_session.query(File).filter_by(path=self.current_file_path).first()
-        )
+        # Read-only; don't flush pending changes just to show the file's tags
+        with self.db_session.no_autoflush:
+            file_obj = (
+                self.db_session.query(File)
+                .options(joinedload(File.tags))
+                .filter_by(path=self.current_file_path)
+                .first()
+            )
         if file_obj:
+            items = []
             for tag in file_obj.tags:
-                tag_color = QColor(tag.color)
-                text_color = Qt.white if is_dark_color(tag_color) else Qt.black
+                tag_color, text_color = get_tag_colors(tag.color)
 
-                self.file_tags_list.addItem(tag.name)
-                item = self.file_tags_list.item(self.file_tags_list.count() - 1)
+                item = QListWidgetItem(tag.name)
                 item.setBackground(tag_color)
                 item.setForeground(text_color)
+                items.append(item)
+            self.add_list_items(self.file_tags_list, items)
+
+    def add_list_items(self, list_widget, items):
+        """Add prebuilt items to a list widget with repaints and signals held."""
+        list_widget.setUpdatesEnabled(False)
+        list_widget.blockSignals(True)
+        try:
+            for item in items:
+                list_widget.addItem(item)
+        finally:
+            list_widget.blockSignals(False)
+            list_widget.setUpdatesEnabled(True)
+
+    def set_all_check_states(self, list_widget, state):
+        """Set the check state of every item in a list widget in one repaint."""
+        list_widget.setUpdatesEnabled(False)
+        try:
+            for i in range(list_widget.count()):
+                list_widget.item(i).setCheckState(state)
+        finally:
+            list_widget.setUpdatesEnabled(True)
 
     def on_file_selected(self, current, previous):
         """Handle file selection changes in the tree view."""
@@ -791,58 +1218,50 @@ class FileTagManager(QMainWindow):
     def on_search_result_double_clicked(self, item):
         """Handle double-click on search result items."""
         file_path = item.toolTip()
-        if not file_path or not os.path.exists(file_path):
+        if not file_path:
+            return
+
+        # One stat call answers both "does it exist" and "is it a file"
+        try:
+            mode = os.stat(file_path).st_mode
+        except OSError:
             return
 
         try:
-            if os.path.isfile(file_path):
+            if stat.S_ISREG(mode):
                 open_file(file_path)
             else:
                 # For directories, navigate to them in the tree view
-                drive = os.path.splitdrive(file_path)[0] + os.path.sep
-                for i in range(self.drive_combo.count()):
-                    if self.drive_combo.itemData(i).startswith(drive):
-                        self.drive_combo.setCurrentIndex(i)
-                        break
-
-                dir_path = (
-                    os.path.dirname(file_path)
-                    if os.path.isfile(file_path)
-                    else file_path
-                )
-                self.tree.setRootIndex(self.model.index(dir_path))
-                self.path_display.setText(dir_path)
-                self.tree.setCurrentIndex(self.model.index(file_path))
-                self.tree.scrollTo(self.model.index(file_path))
+                self._select_drive_for_path(file_path)
+
+                index = self.model.index(file_path)
+                self.tree.setRootIndex(index)
+                self.path_display.setText(file_path)
+                self.tree.setCurrentIndex(index)
+                self.tree.scrollTo(index)
         except Exception as e:
             QMessageBox.warning(self, "Error", str(e))
 
-    def on_search_result_right_clicked(self, position):
+    def on_search_result_right_clicked(self, widget, position):
         """Handle right-click on search result items to show context menu."""
-        item = self.sender().itemAt(position)
+        item = widget.itemAt(position)
         if not item:
             return
 
-        context_menu = QMenu(self)
         file_path = item.toolTip()
         if not file_path or not os.path.exists(file_path):
             return
 
-        open_action = context_menu.addAction("Open File")
-        open_in_folder_action = context_menu.addAction("Open Containing Folder")
-        reindex_action = context_menu.addAction("Force Reindex")
-        remove_action = context_menu.addAction("Remove from Search Index")
-
-        action = context_menu.exec_(self.sender().mapToGlobal(position))
+        action = self._result_menu.exec_(widget.mapToGlobal(position))
 
         try:
-            if action == open_action:
+            if action == self._act_open:
                 open_file(file_path)
-            elif action == open_in_folder_action:
+            elif action == self._act_folder:
                 open_containing_folder(file_path)
-            elif action == reindex_action:
+            elif action == self._act_reindex:
                 self.force_reindex_file(file_path)
-            elif action == remove_action:
+            elif action == self._act_remove:
                 self._remove_from_vector_db(file_path)
         except Exception as e:
             QMessageBox.warning(self, "Error", str(e))
@@ -860,10 +1279,7 @@ class FileTagManager(QMainWindow):
         )
 
         if reply == QMessageBox.Yes:
-            # Remove from vector database
-            success_vector = self.vector_search.remove_file(file_path)
-
-            # Remove from tag database
+            # Remove from tag database; the session belongs to the GUI thread
             success_tags = False
             try:
                 file_obj = self.db_session.query(File).filter_by(path=file_path).first()
@@ -872,75 +1288,81 @@ class FileTagManager(QMainWindow):
                     self.db_session.commit()
                     success_tags = True
             except Exception as e:
-                print(f"Error removing file from tag database: {str(e)}")
-                import traceback
-
-                traceback.print_exc()
-
-            if success_vector and success_tags:
-                QMessageBox.information(
-                    self,
-                    "Success",
-                    "File removed from search index and tag database successfully.\n\n"
-                    "The file is still on your computer.",
-                )
-                self._remove_item_from_results(file_path)
-            elif success_vector:
-                QMessageBox.warning(
-                    self,
-                    "Partial Success",
-                    "File was removed from search index but could not be removed from tag database.",
-                )
-                self._remove_item_from_results(file_path)
-            elif success_tags:
-                QMessageBox.warning(
-                    self,
-                    "Partial Success",
-                    "File was removed from tag database but could not be removed from search index.",
-                )
-                self._remove_item_from_results(file_path)
-            else:
-                QMessageBox.warning(
-                    self,
-                    "Error",
-                    "Could not remove file from search index or tag database. See console for details.",
-                )
+                self.logger.exception("Error removing file from tag database: %s", e)
+
+            def on_remove_finished(success_vector):
+                self.report_file_removal(file_path, success_vector, success_tags)
+
+            # Remove from vector database in the background
+            self.remove_thread = VectorRemoveThread(self.vector_search, file_path)
+            # Parent the thread so it survives a second removal starting meanwhile
+            self.remove_thread.setParent(self)
+            self.remove_thread.finished.connect(self.remove_thread.deleteLater)
+            self.remove_thread.remove_finished.connect(on_remove_finished)
+            self.remove_thread.start()
+
+    def report_file_removal(self, file_path, success_vector, success_tags):
+        """Report the outcome of removing a file from the index and tag database."""
+        if success_vector and success_tags:
+            QMessageBox.information(
+                self,
+                "Success",
+                "File removed from search index and tag database successfully.\n\n"
+                "The file is still on your computer.",
+            )
+            self._remove_item_from_results(file_path)
+        elif success_vector:
+            QMessageBox.warning(
+                self,
+                "Partial Success",
+                "File was removed from search index but could not be removed from tag database.",
+            )
+            self._remove_item_from_results(file_path)
+        elif success_tags:
+            QMessageBox.warning(
+                self,
+                "Partial Success",
+                "File was removed from tag database but could not be removed from search index.",
+            )
+            self._remove_item_from_results(file_path)
+        else:
+            QMessageBox.warning(
+                self,
+                "Error",
+                "Could not remove file from search index or tag database. See console for details.",
+            )
 
     def _remove_item_from_results(self, file_path):
         """Remove items with the given file path from search results lists."""
         current_tab = self.main_tabs.currentIndex()
 
         if current_tab == 1:  # Search tab
-            search_tabs = self.main_tabs.widget(1).layout().itemAt(0).widget()
-            current_search_tab = search_tabs.currentIndex()
+            current_search_tab = self.search_tabs.currentIndex()
 
             if current_search_tab == 0:  # Tag search tab
-                for i in range(self.search_results.count()):
-                    item = self.search_results.item(i)
-                    if item and item.toolTip() == file_path:
-                        self.search_results.takeItem(i)
-                        break
+                item = self._tag_result_items.pop(file_path, None)
+                if item is not None:
+                    self.search_results.takeItem(self.search_results.row(item))
             elif current_search_tab == 1:  # RAG search tab
-                for i in range(self.rag_search_results.count()):
-                    item = self.rag_search_results.item(i)
-                    if item and item.toolTip() == file_path:
-                        self.rag_search_results.takeItem(i)
-                        j = i + 1
-                        while j < self.rag_search_results.count():
-                            next_item = self.rag_search_results.item(j)
-                            if next_item and next_item.text().startswith("    ↪"):
-                                self.rag_search_results.takeItem(j)
-                            else:
-                                break
-                        break
+                if file_path not in self._rag_result_index:
+                    return
+                row, span = self._rag_result_index.pop(file_path)
+                self._checked_results.pop(file_path, None)
+                # Remove the file row along with its summary, tag and snippet rows
+                for _ in range(span):
+                    self.rag_search_results.takeItem(row)
+                # Shift the rows of results displayed below the removed one
+                self._rag_result_index = {
+                    path: (start - span if start > row else start, count)
+                    for path, (start, count) in self._rag_result_index.items()
+                }
 
     def add_tag(self):
         """Add a new tag."""
         tag_name, ok = QInputDialog.getText(self, "Add Tag", "Enter tag name:")
         if ok and tag_name:
             # Check if tag already exists
-            existing = self.db_session.query(Tag).filter_by(name=tag_name).first()
-            if existing:
+            if tag_name in self._tags_by_name:
                 QMessageBox.warning(
                     self, "Error", "A tag with this name already exists!"
                 )
@@ -959,14 +1381,14 @@ class FileTagManager(QMainWindow):
 
     def edit_tag(self):
         """Edit the selected tag."""
-        selected_items = self.tag_list.selectedItems()
-        if not selected_items:
+        selected_names = self.selected_tag_names(self.tag_list)
+        if not selected_names:
             QMessageBox.warning(self, "Error", "Please select a tag to edit!")
             return
 
         # Get the selected tag
-        tag_name = selected_items[0].text()
-        tag = self.db_session.query(Tag).filter_by(name=tag_name).first()
+        tag_name = selected_names[0]
+        tag = self._tags_by_name.get(tag_name)
         if not tag:
             return
 
@@ -979,8 +1401,7 @@ class FileTagManager(QMainWindow):
 
         # Check if new name already exists (if different from current)
         if new_name != tag.name:
-            existing = self.db_session.query(Tag).filter_by(name=new_name).first()
-            if existing:
+            if new_name in self._tags_by_name:
                 QMessageBox.warning(
                     self, "Error", "A tag with this name already exists!"
                 )
@@ -990,19 +1411,19 @@ class FileTagManager(QMainWindow):
         initial_color = QColor(tag.color)
         color = QColorDialog.getColor(initial=initial_color)
         if color.isValid():
-            # Update tag
-            tag.name = new_name
-            tag.color = color.name()
+            # Update tag; the commit expires any loaded copies of it
+            self.db_session.query(Tag).filter(Tag.id == tag.id).update(
+                {"name": new_name, "color": color.name()}, synchronize_session=False
+            )
             self.db_session.commit()
 
             # Refresh tag lists
-            self.refresh_tags()
-            self.refresh_file_tags()
+            self.refresh_tag_views()
 
     def delete_tag(self):
         """Delete the selected tag(s)."""
-        selected_items = self.tag_list.selectedItems()
-        if not selected_items:
+        selected_names = self.selected_tag_names(self.tag_list)
+        if not selected_names:
             QMessageBox.warning(self, "Error", "Please select tag(s) to delete!")
             return
 
@@ -1010,20 +1431,28 @@ class FileTagManager(QMainWindow):
         reply = QMessageBox.question(
             self,
             "Confirm Delete",
-            f"Are you sure you want to delete {len(selected_items)} tag(s)?",
+            f"Are you sure you want to delete {len(selected_names)} tag(s)?",
             QMessageBox.Yes | QMessageBox.No,
             QMessageBox.No,
         )
 
         if reply == QMessageBox.Yes:
-            for item in selected_items:
-                tag = self.db_session.query(Tag).filter_by(name=item.text()).first()
-                if tag:
-                    self.db_session.delete(tag)
+            tag_ids = [
+                self._tags_by_name[name].id
+                for name in selected_names
+                if name in self._tags_by_name
+            ]
+            # Two bulk DELETEs instead of loading and deleting each tag's file links;
+            # the commit expires any loaded File.tags collections
+            self.db_session.execute(
+                file_tags.delete().where(file_tags.c.tag_id.in_(tag_ids))
+            )
+            self.db_session.query(Tag).filter(Tag.id.in_(tag_ids)).delete(
+                synchronize_session=False
+            )
 
             self.db_session.commit()
-            self.refresh_tags()
-            self.refresh_file_tags()
+            self.refresh_tag_views()
 
     def add_tag_to_file(self):
         """Add selected tag(s) to the current file."""
@@ -1031,138 +1460,61 @@ class FileTagManager(QMainWindow):
             QMessageBox.warning(self, "Error", "Please select a file first!")
             return
 
-        selected_items = self.tag_list.selectedItems()
-        if not selected_items:
+        selected_names = self.selected_tag_names(self.tag_list)
+        if not selected_names:
             QMessageBox.warning(self, "Error", "Please select tag(s) to add!")
             return
 
-        # DEBUGGING: Add console output to track what's happening
-        print(f"\n=== DEBUGGING: Adding tags to file: {self.current_file_path} ===")
+        self.logger.debug("Adding tags to file: %s", self.current_file_path)
 
         # Get or create file record
         file_obj = (
-            self.db_session.query(File).filter_by(path=self.current_file_path).first()
+            self.db_session.query(File)
+            .options(joinedload(File.tags))
+            .filter_by(path=self.current_file_path)
+            .first()
         )
         is_new_file = False
         if not file_obj:
-            print("DEBUGGING: File not found in database, creating new record")
+            self.logger.debug("File not found in database, creating new record")
             file_obj = File(path=self.current_file_path)
             self.db_session.add(file_obj)
             is_new_file = True
-        else:
-            print(
-                f"DEBUGGING: File found in database with {len(file_obj.tags)} existing tags"
-            )
 
         # Track if file had tags before this operation
         had_tags_before = len(file_obj.tags) > 0
-        print(
-            f"DEBUGGING: had_tags_before = {had_tags_before}, is_new_file = {is_new_file}"
+        self.logger.debug(
+            "had_tags_before = %s, is_new_file = %s", had_tags_before, is_new_file
         )
 
-        # Add selected tags
+        # Add selected tags, loading their ORM rows in one query
+        tags_by_name = {
+            tag.name: tag
+            for tag in self.db_session.query(Tag).filter(Tag.name.in_(selected_names))
+        }
         tags_added = []
-        for item in selected_items:
-            tag = self.db_session.query(Tag).filter_by(name=item.text()).first()
-            if tag and tag not in file_obj.tags:
+        existing_tags = set(file_obj.tags)
+        for tag_name in selected_names:
+            tag = tags_by_name.get(tag_name)
+            if tag and tag not in existing_tags:
                 file_obj.tags.append(tag)
-                tags_added.append(tag.name)
+                existing_tags.add(tag)
+                tags_added.append(tag_name)
 
-        print(f"DEBUGGING: Added tags: {tags_added}")
+        self.logger.debug("Added tags: %s", tags_added)
 
         # Perform database commit - this will generate ID for new files
         self.db_session.commit()
-        print("DEBUGGING: Database commit completed")
-
-        # IMPORTANT: Check if this triggers vector indexing
-        print("DEBUGGING: Checking if file should be indexed")
-        if is_new_file or not had_tags_before:
-            print("DEBUGGING: File should be indexed (new file or first tags)")
-            try:
-                from vector_search.content_extractor import ContentExtractor
-
-                # Extract content from the file
-                print(f"DEBUGGING: Extracting content from: {self.current_file_path}")
-                # Get the PDF extractor setting from config
-                pdf_extractor = self.config.get_pdf_extractor()
-                print(f"DEBUGGING: Using PDF extractor mode: {pdf_extractor}")
-                content = ContentExtractor.extract_file_content(
-                    self.current_file_path, pdf_extractor=pdf_extractor
-                )
-
-                if content:
-                    content_preview = (
-                        content[:100] + "..." if len(content) > 100 else content
-                    )
-                    print(
-                        f"DEBUGGING: Content extracted, length: {len(content)} characters"
-                    )
-                    print(f"DEBUGGING: Content preview: {content_preview}")
-
-                    # Add file to vector database - this is the critical step!
-                    print(
-                        f"DEBUGGING: Calling vector_search.index_file for: {self.current_file_path}"
-                    )
-                    try:
-                        self.vector_search.index_file(self.current_file_path, content)
-                        print(
-                            f"DEBUGGING: Successfully indexed file in vector search: {self.current_file_path}"
-                        )
-
-                        # Verify the file was actually indexed
-                        try:
-                            results = self.vector_search.collection.get(
-                                ids=[self.current_file_path], include=["metadatas"]
-                            )
-                            if results and results["ids"] and len(results["ids"]) > 0:
-                                print(
-                                    f"DEBUGGING: Verification successful - file found in vector store"
-                                )
-                                print(
-                                    f"DEBUGGING: File metadata: {results['metadatas'][0]}"
-                                )
-                            else:
-                                print(
-                                    f"DEBUGGING: VERIFICATION FAILED - file not found in vector store after indexing!"
-                                )
-                        except Exception as verify_err:
-                            print(
-                                f"DEBUGGING: Error verifying file in vector store: {str(verify_err)}"
-                            )
-                    except Exception as index_err:
-                        print(
-                            f"DEBUGGING: Error in index_file method: {str(index_err)}"
-                        )
-                        import traceback
-
-                        traceback.print_exc()
-                else:
-                    print(
-                        f"DEBUGGING: WARNING - No content could be extracted from file: {self.current_file_path}"
-                    )
-            except Exception as e:
-                import traceback
 
-                print(f"DEBUGGING: Error adding file to vector search: {str(e)}")
-                print("DEBUGGING: Detailed error information:")
-                traceback.print_exc()
-        else:
-            # If the file was already tagged before, just update the tags metadata
-            print("DEBUGGING: File already had tags, updating metadata only")
-            try:
-                self.vector_search.update_metadata(self.current_file_path)
-                print(
-                    f"DEBUGGING: Updated tags metadata for file in vector search: {self.current_file_path}"
-                )
-            except Exception as e:
-                import traceback
-
-                print(f"DEBUGGING: Error updating vector search metadata: {str(e)}")
-                traceback.print_exc()
+        # Index the file the first time it is tagged, otherwise just update its
+        # tags metadata; re-adding tags it already has leaves the index as it is.
+        # Extraction and summarizing run on the background index thread.
+        newly_tagged = is_new_file or not had_tags_before
+        if newly_tagged or tags_added:
+            self._queue_vector_update(self.current_file_path, newly_tagged)
 
         # Refresh file tags display
         self.refresh_file_tags()
-        print("DEBUGGING: UI refreshed with updated tags")
 
     def remove_tag_from_file(self):
         """Remove selected tag(s) from the current file."""
@@ -1176,13 +1528,15 @@ class FileTagManager(QMainWindow):
             return
 
         file_obj = (
-            self.db_session.query(File).filter_by(path=self.current_file_path).first()
+            self.db_session.query(File)
+            .options(joinedload(File.tags))
+            .filter_by(path=self.current_file_path)
+            .first()
         )
         if file_obj:
-            for item in selected_items:
-                tag = self.db_session.query(Tag).filter_by(name=item.text()).first()
-                if tag in file_obj.tags:
-                    file_obj.tags.remove(tag)
+            selected_names = {item.text() for item in selected_items}
+            for tag in [t for t in file_obj.tags if t.name in selected_names]:
+                file_obj.tags.remove(tag)
 
             self.db_session.commit()
             self.refresh_file_tags()
@@ -1197,37 +1551,79 @@ class FileTagManager(QMainWindow):
             self.config, self.db_session, self.current_file_path, self
         )
         if dialog.exec():
-            self.refresh_file_tags()
+            # The dialog may have created new tags
+            self.refresh_tag_views()
 
     def search_by_tags(self):
         """Search for files with selected tags."""
-        selected_items = self.search_tag_list.selectedItems()
-        if not selected_items:
+        tag_names = self.selected_tag_names(self.search_tag_list)
+        if not tag_names:
             QMessageBox.warning(self, "Error", "Please select tag(s) to search for!")
             return
 
-        # Build query
-        query = self.db_session.query(File).distinct()
-        tag_names = [item.text() for item in selected_items]
-
-        if self.and_radio.isChecked():
-            # Files must have ALL selected tags
-            for tag_name in tag_names:
-                tag = self.db_session.query(Tag).filter_by(name=tag_name).first()
-                if tag:
-                    query = query.filter(File.tags.contains(tag))
+        if self.and_radio.isChecked() and len(tag_names) <= AND_SEARCH_INTERSECT_LIMIT:
+            # Files must have ALL selected tags; look their paths up in batches
+            # to stay under SQLite's bound-parameter limit
+            file_ids = list(self._file_ids_with_all_tags(tag_names))
+            paths = []
+            for start in range(0, len(file_ids), PATH_QUERY_BATCH_SIZE):
+                batch = file_ids[start : start + PATH_QUERY_BATCH_SIZE]
+                paths.extend(
+                    row[0]
+                    for row in self.db_session.query(File.path).filter(
+                        File.id.in_(batch)
+                    )
+                )
         else:
-            # Files must have ANY of the selected tags
-            tags = self.db_session.query(Tag).filter(Tag.name.in_(tag_names)).all()
-            query = query.filter(File.tags.any(Tag.id.in_([t.id for t in tags])))
+            # Build query
+            query = self.db_session.query(File).distinct()
+            if self.and_radio.isChecked():
+                # Files must have ALL selected tags
+                query = (
+                    query.join(File.tags)
+                    .filter(Tag.name.in_(tag_names))
+                    .group_by(File.id)
+                    .having(func.count(Tag.id.distinct()) == len(set(tag_names)))
+                )
+            else:
+                # Files must have ANY of the selected tags
+                tags = self.db_session.query(Tag).filter(Tag.name.in_(tag_names)).all()
+                query = query.filter(File.tags.any(Tag.id.in_([t.id for t in tags])))
+
+            # Fetch plain path strings rather than hydrating File objects
+            paths = [row[0] for row in query.with_entities(File.path).all()]
 
         # Display results
+        present = existing_paths(paths)
+        self._tag_result_items = {}
+        for path in paths:
+            if path in present:
+                item = QListWidgetItem(os.path.basename(path))
+                item.setToolTip(path)
+                self._tag_result_items[path] = item
         self.search_results.clear()
-        for file in query.all():
-            if os.path.exists(file.path):
-                item = QListWidgetItem(os.path.basename(file.path))
-                item.setToolTip(file.path)
-                self.search_results.addItem(item)
+        self.add_list_items(self.search_results, self._tag_result_items.values())
+
+    def _file_ids_with_all_tags(self, tag_names):
+        """Return the ids of files that have every one of the given tags."""
+        # One indexed lookup per tag on the association table, intersected
+        # in Python; stops early once no file can match
+        file_ids = None
+        for tag_name in tag_names:
+            tag = self._tags_by_name.get(tag_name)
+            if not tag:
+                # No file can have a tag that doesn't exist
+                return set()
+            tag_file_ids = {
+                row[0]
+                for row in self.db_session.query(file_tags.c.file_id).filter(
+                    file_tags.c.tag_id == tag.id
+                )
+            }
+            file_ids = tag_file_ids if file_ids is None else file_ids & tag_file_ids
+            if not file_ids:
+                break
+        return file_ids or set()
 
     def search_by_content(self):
         """Search for files using semantic search."""
@@ -1237,25 +1633,69 @@ class FileTagManager(QMainWindow):
             return
 
         # Get selected tags for filtering
-        tag_filters = []
-        for i in range(self.tag_filter_list.count()):
-            item = self.tag_filter_list.item(i)
-            if item.isSelected():
-                tag_filters.append(item.text())
+        tag_filters = self.selected_tag_names(self.tag_filter_list)
 
-        # Perform search
-        try:
-            results = self.vector_search.search(
-                query,
-                tag_filter=tag_filters,
-                use_and=self.rag_and_radio.isChecked(),
-                limit=20,
-            )
+        # Any search still running is now stale
+        self._search_epoch += 1
+        epoch = self._search_epoch
+
+        # Show a busy indicator while the search runs
+        progress = QProgressDialog("Searching...", "Cancel", 0, 0, self)
+        progress.setWindowTitle("Content Search")
+        progress.setWindowModality(Qt.WindowModal)
+        progress.setMinimumDuration(0)
+        progress.show()
+        self.search_btn.setEnabled(False)
+
+        def on_search_canceled():
+            if epoch == self._search_epoch:
+                self._search_epoch += 1
+                self.search_btn.setEnabled(True)
+
+        def on_search_finished(results):
+            progress.close()
+            if epoch != self._search_epoch:
+                return
+            self.search_btn.setEnabled(True)
+            self.display_content_results(results)
 
+        def on_search_error(error):
+            progress.close()
+            if epoch != self._search_epoch:
+                return
+            self.search_btn.setEnabled(True)
+            QMessageBox.warning(self, "Error", f"Search failed: {error}")
+            self.chat_results_btn.setEnabled(False)
+            self.current_search_results = []
+
+        # Run the embedding and vector lookup off the UI thread
+        self.search_thread = VectorSearchThread(
+            self.vector_search,
+            query,
+            tag_filters,
+            self.rag_and_radio.isChecked(),
+            limit=20,
+        )
+        # Parent the thread so a cancelled search can finish after a new one starts
+        self.search_thread.setParent(self)
+        self.search_thread.finished.connect(self.search_thread.deleteLater)
+        self.search_thread.search_finished.connect(on_search_finished)
+        self.search_thread.search_error.connect(on_search_error)
+        progress.canceled.connect(on_search_canceled)
+        self.search_thread.start()
+
+    def display_content_results(self, results):
+        """Show semantic search results in the content search results list."""
+        # Hold repaints and item signals until the whole list is built
+        self.rag_search_results.setUpdatesEnabled(False)
+        self.rag_search_results.blockSignals(True)
+        try:
             # Display results
             self.rag_search_results.clear()
+            self._rag_result_index = {}
+            self._checked_results = {}
 
-            if not results or len(results) == 0:
+            if not results:
                 self.chat_results_btn.setEnabled(False)
                 self.current_search_results = []
                 return
@@ -1263,28 +1703,27 @@ class FileTagManager(QMainWindow):
             # Store all results for reference
             self.current_search_results = results
 
-            # Keep track of which list items correspond to documents (not snippets)
-            self.result_document_items = {}
+            # Check existence with one directory listing per folder
+            present = existing_paths([result["path"] for result in results])
 
             for result in results:
-                if os.path.exists(result["path"]):
+                path = result["path"]
+                if path in present:
+                    first_row = self.rag_search_results.count()
+
                     # Add file item with checkbox
                     score = result.get("score", 0)
+                    bg_color = get_score_color(score)
 
                     # Create main file item
-                    file_item = QListWidgetItem(
-                        f"{os.path.basename(result['path'])} ({score:.2f})"
-                    )
-                    file_item.setToolTip(result["path"])
-                    file_item.setBackground(get_score_color(score))
-                    file_item.setFlags(
-                        file_item.flags() | Qt.ItemFlag.ItemIsUserCheckable
-                    )
+                    file_item = QListWidgetItem(f"{os.path.basename(path)} ({score:.2f})")
+                    file_item.setToolTip(path)
+                    file_item.setData(Qt.UserRole, result)
+                    file_item.setBackground(bg_color)
+                    # New list items are already user-checkable
                     file_item.setCheckState(Qt.CheckState.Unchecked)
                     self.rag_search_results.addItem(file_item)
 
-                    # Store reference to this item for selection tracking
-                    self.result_document_items[result["path"]] = file_item
                     # Display document summary if available
                     summary = result.get("summary", "")
                     if summary:
@@ -1292,10 +1731,8 @@ class FileTagManager(QMainWindow):
                         formatted_summary = f"<div style='text-align:left; margin-left:4px; margin-right:4px;'>    📝 {summary}</div>"
                         summary_item = QListWidgetItem()
                         summary_item.setText(formatted_summary)
-                        summary_item.setToolTip(result["path"])
-                        # Use lighter background to differentiate from main result
-                        bg_color = get_score_color(score)
-                        # Make the background slightly lighter for summary
+                        summary_item.setToolTip(path)
+                        # Use a lighter background to differentiate from main result
                         lighter_bg = QColor(
                             min(bg_color.red() + 15, 255),
                             min(bg_color.green() + 15, 255),
@@ -1305,14 +1742,12 @@ class FileTagManager(QMainWindow):
                         self.rag_search_results.addItem(summary_item)
 
                     # Display tags on a separate line with colored backgrounds for each tag
-                    tags = result.get("tags", [])
+                    tags = result.get("tags", _EMPTY)
                     if tags:
                         tag_display = "    ⚑ Tags: "
                         tags_item = QListWidgetItem(tag_display)
-                        tags_item.setToolTip(result["path"])
-                        # Use lighter background to differentiate from main result
-                        bg_color = get_score_color(score)
-                        # Make the background slightly lighter
+                        tags_item.setToolTip(path)
+                        # Use a lighter background to differentiate from main result
                         lighter_bg = QColor(
                             min(bg_color.red() + 20, 255),
                             min(bg_color.green() + 20, 255),
@@ -1323,30 +1758,30 @@ class FileTagManager(QMainWindow):
 
                         # Add each tag with its proper color
                         for tag_name in tags:
-                            # Look up the tag color from the database
-                            tag = (
-                                self.db_session.query(Tag)
-                                .filter_by(name=tag_name)
-                                .first()
-                            )
+                            # Look up the tag color from the cached tag rows
+                            tag = self._tags_by_name.get(tag_name)
                             if tag:
-                                tag_color = QColor(tag.color)
-                                text_color = (
-                                    Qt.white if is_dark_color(tag_color) else Qt.black
-                                )
+                                tag_color, text_color = get_tag_colors(tag.color)
 
                                 # Create a tag item with spacing for visual separation
                                 tag_item = QListWidgetItem(f"        • {tag_name}")
-                                tag_item.setToolTip(result["path"])
+                                tag_item.setToolTip(path)
                                 tag_item.setBackground(tag_color)
                                 tag_item.setForeground(text_color)
                                 self.rag_search_results.addItem(tag_item)
 
+                    # Snippet rows share one lighter background per result
+                    snippet_bg = QColor(
+                        min(bg_color.red() + 40, 255),
+                        min(bg_color.green() + 40, 255),
+                        min(bg_color.blue() + 40, 255),
+                    )
+
                     # Add snippet items if available
-                    for snippet in result.get("snippets", []):
+                    for snippet in result.get("snippets", _EMPTY):
                         # Create a rich text item that can show bold formatting
                         snippet_item = QListWidgetItem()
-                        snippet_item.setToolTip(result["path"])
+                        snippet_item.setToolTip(path)
 
                         # Check if this is already a formatted snippet with a context
                         if (
@@ -1360,10 +1795,10 @@ class FileTagManager(QMainWindow):
                             text = snippet[context_end + 1 :].strip()
 
                             # Create formatted text with context prefix in italics
-                            formatted_text = f"    ↪ <i>{context}:</i> {text}"
+                            formatted_text = f"{SNIPPET_PREFIX}<i>{context}:</i> {text}"
                         else:
                             # Just use the snippet text as-is
-                            formatted_text = f"    ↪ {snippet}"
+                            formatted_text = f"{SNIPPET_PREFIX}{snippet}"
                         # Set the text with HTML formatting that preserves bold highlighting
                         # (the ** marks from markdown are converted to HTML <b> tags)
                         formatted_text = formatted_text.replace("**", "<b>", 1)
@@ -1376,27 +1811,69 @@ class FileTagManager(QMainWindow):
                         snippet_item.setText(formatted_text)
 
                         # Apply lighter background color for snippet items
-                        lighter_bg = QColor(
-                            min(bg_color.red() + 40, 255),
-                            min(bg_color.green() + 40, 255),
-                            min(bg_color.blue() + 40, 255),
-                        )
-                        snippet_item.setBackground(lighter_bg)
+                        snippet_item.setBackground(snippet_bg)
 
                         # Add to results list
                         self.rag_search_results.addItem(snippet_item)
 
+                    # Remember which rows belong to this result
+                    self._rag_result_index[path] = (
+                        first_row,
+                        self.rag_search_results.count() - first_row,
+                    )
+
             # Enable chat button if results are available
             self.chat_results_btn.setEnabled(True)
 
+            # Load the top documents while the user decides what to chat about
+            self.prefetch_chat_context(list(self._rag_result_index)[:CHAT_PREFETCH_COUNT])
+
         except Exception as e:
             QMessageBox.warning(self, "Error", f"Search failed: {str(e)}")
             self.chat_results_btn.setEnabled(False)
             self.current_search_results = []
-            self.result_document_items = {}
+            self._rag_result_index = {}
+            self._checked_results = {}
+        finally:
+            self.rag_search_results.blockSignals(False)
+            self.rag_search_results.setUpdatesEnabled(True)
+
+    def prefetch_chat_context(self, file_paths):
+        """Extract document text for the chat dialog in the background."""
+        pdf_extractor = self.config.get_pdf_extractor()
+        cached_paths = {
+            path
+            for path, _, extractor in self._chat_ctx_cache
+            if extractor == pdf_extractor
+        }
+        file_paths = [path for path in file_paths if path not in cached_paths]
+        if not file_paths:
+            return
+
+        def on_content_ready(file_path, mtime, content):
+            key = (file_path, mtime, pdf_extractor)
+            self._chat_ctx_cache[key] = content
+            self._chat_ctx_cache.move_to_end(key)
+            while len(self._chat_ctx_cache) > CHAT_CONTEXT_CACHE_SIZE:
+                self._chat_ctx_cache.popitem(last=False)
+
+        self.prefetch_thread = ChatContextPrefetchThread(
+            self.vector_search, file_paths, pdf_extractor
+        )
+        self.prefetch_thread.setParent(self)
+        self.prefetch_thread.finished.connect(self.prefetch_thread.deleteLater)
+        self.prefetch_thread.content_ready.connect(on_content_ready)
+        self.prefetch_thread.start()
 
     def reindex_files(self):
         """Reindex all files in the vector database."""
+        # A cancelled reindex keeps running until its current file is done
+        if self._deferred_index_updates is not None:
+            QMessageBox.information(
+                self, "Reindex Files", "A reindex is still finishing. Please wait."
+            )
+            return
+
         reply = QMessageBox.question(
             self,
             "Reindex Files",
@@ -1410,50 +1887,83 @@ class FileTagManager(QMainWindow):
         if reply == QMessageBox.Yes:
             progress = QProgressDialog("Reindexing files...", "Cancel", 0, 100, self)
             progress.setWindowModality(Qt.WindowModal)
+            progress.setAutoClose(False)
+            progress.setMinimumDuration(0)
 
-            try:
-                self.vector_search.reindex_all(
-                    progress_callback=lambda msg, p: progress.setValue(p)
-                )
-                QMessageBox.information(
-                    self, "Success", "Files reindexed successfully!"
+            def on_reindex_progress(message, percent):
+                progress.setLabelText(message)
+                progress.setValue(percent)
+
+            def resume_index_updates():
+                deferred, self._deferred_index_updates = (
+                    self._deferred_index_updates,
+                    None,
                 )
-            except Exception as e:
-                QMessageBox.warning(self, "Error", f"Reindexing failed: {str(e)}")
-            finally:
+                for file_path, newly_tagged in deferred:
+                    self._queue_vector_update(file_path, newly_tagged)
+
+            def on_reindex_finished():
                 progress.close()
+                resume_index_updates()
+                if reindex_thread.stop_requested:
+                    QMessageBox.warning(
+                        self,
+                        "Reindexing Cancelled",
+                        "Reindexing was cancelled. The search index is incomplete "
+                        "until the files are reindexed again.",
+                    )
+                else:
+                    QMessageBox.information(
+                        self, "Success", "Files reindexed successfully!"
+                    )
+
+            def on_reindex_error(error):
+                progress.close()
+                resume_index_updates()
+                QMessageBox.warning(self, "Error", f"Reindexing failed: {error}")
+
+            # Rebuild the index in the background so the dialog stays responsive
+            # Hold back index updates until the new collection is handed over
+            self._deferred_index_updates = []
+            reindex_thread = ReindexThread(self.vector_search)
+            # Parent the thread so it outlives this method and cleans itself up
+            reindex_thread.setParent(self)
+            reindex_thread.finished.connect(reindex_thread.deleteLater)
+            reindex_thread.reindex_progress.connect(on_reindex_progress)
+            reindex_thread.reindex_finished.connect(on_reindex_finished)
+            reindex_thread.reindex_error.connect(on_reindex_error)
+            progress.canceled.connect(reindex_thread.stop)
+            reindex_thread.start()
+
+    def on_rag_result_changed(self, item):
+        """Track checked documents, refusing more than the chat can take."""
+        result = item.data(Qt.UserRole)
+        if result is None:
+            return
+
+        path = result["path"]
+        if item.checkState() != Qt.CheckState.Checked:
+            self._checked_results.pop(path, None)
+        elif len(self._checked_results) < MAX_CHAT_DOCUMENTS:
+            self._checked_results[path] = result
+        elif path not in self._checked_results:
+            self.rag_search_results.blockSignals(True)
+            item.setCheckState(Qt.CheckState.Unchecked)
+            self.rag_search_results.blockSignals(False)
+            self.statusBar().showMessage(
+                f"You can select up to {MAX_CHAT_DOCUMENTS} documents.", 5000
+            )
 
     def chat_with_results(self):
         """Open the chat dialog with selected documents (up to 3)."""
         try:
             # Get selected documents
-            selected_docs = []
-            checked_count = 0
-
-            # Check if we have document items and search results
-            if hasattr(self, "result_document_items") and hasattr(
-                self, "current_search_results"
-            ):
-                # Count number of checked items and get their corresponding results
-                for file_path, item in self.result_document_items.items():
-                    if item.checkState() == Qt.CheckState.Checked:
-                        checked_count += 1
-                        # Find the matching result in current_search_results
-                        for result in self.current_search_results:
-                            if result["path"] == file_path:
-                                selected_docs.append(result)
-                                break
+            selected_docs = list(self._checked_results.values())
 
             # If no documents are specifically selected, use the first 3 from search results
-            if (
-                not selected_docs
-                and hasattr(self, "current_search_results")
-                and self.current_search_results
-            ):
+            if not selected_docs and self.current_search_results:
                 # Limit to first 3 documents if none are selected
-                selected_docs = self.current_search_results[
-                    : min(3, len(self.current_search_results))
-                ]
+                selected_docs = self.current_search_results[:MAX_CHAT_DOCUMENTS]
                 message = "No documents selected. Using top search results."
                 QMessageBox.information(self, "Information", message)
 
@@ -1465,15 +1975,6 @@ class FileTagManager(QMainWindow):
                 )
                 return
 
-            # Check if more than 3 documents are selected
-            if checked_count > 3:
-                QMessageBox.warning(
-                    self,
-                    "Too Many Documents",
-                    "You can select up to 3 documents. Please uncheck some documents.",
-                )
-                return
-
             # Get AI service
             ai_service = self.config.get_ai_service()
             if ai_service is None:
@@ -1486,7 +1987,12 @@ class FileTagManager(QMainWindow):
 
             # Open the chat dialog with selected documents
             dialog = ChatWithResultsDialog(
-                self, ai_service, selected_docs, self.query_input.text().strip()
+                self,
+                ai_service,
+                selected_docs,
+                self.query_input.text().strip(),
+                content_cache=self._chat_ctx_cache,
+                pdf_extractor=self.config.get_pdf_extractor(),
             )
             dialog.exec()
 
@@ -1531,9 +2037,6 @@ class FileTagManager(QMainWindow):
             )
             return
 
-        # Import threading here to avoid circular imports
-        from PySide6.QtCore import QThread, Signal
-
         class ScanThread(QThread):
             """Thread to scan directory for untagged files without blocking UI."""
 
@@ -1543,57 +2046,98 @@ class FileTagManager(QMainWindow):
             )  # dictionary mapping file paths to tag suggestions
             scan_error = Signal(str)  # error message
 
-            def __init__(self, directory, db_session, config):
+            def __init__(self, directory, config):
                 super().__init__()
                 self.directory = directory
-                self.db_session = db_session
                 self.config = config
                 self.stop_requested = False
 
+            def iter_file_batches(self):
+                """Yield the directory's files (not subdirectories) in batches."""
+                batch = []
+                with os.scandir(self.directory) as entries:
+                    for entry in entries:
+                        if entry.is_file() and not entry.name.startswith("."):
+                            batch.append(entry.path)
+                            if len(batch) == PATH_QUERY_BATCH_SIZE:
+                                yield batch
+                                batch = []
+                if batch:
+                    yield batch
+
             def run(self):
+                # The window's session belongs to the GUI thread, so use a
+                # separate one; it is also the only one writing suggestions
+                db_session = SessionLocal()
                 try:
-                    # List all files in directory (not subdirectories)
-                    files = []
-                    with os.scandir(self.directory) as entries:
-                        for entry in entries:
-                            if entry.is_file() and not entry.name.startswith("."):
-                                files.append(entry.path)
-
-                    # Initialize progress
-                    total_files = len(files)
+                    # Check which files are not in database or have no tags,
+                    # one query per batch of listed files
+                    total_files = 0
+                    pending = []
+                    for batch in self.iter_file_batches():
+                        if self.stop_requested:
+                            return
+
+                        total_files += len(batch)
+                        tagged_paths = {
+                            row[0]
+                            for row in db_session.query(File.path).filter(
+                                File.path.in_(batch), File.tags.any()
+                            )
+                        }
+                        pending.extend(
+                            path for path in batch if path not in tagged_paths
+                        )
+
                     if total_files == 0:
                         self.scan_finished.emit({})
                         return
 
-                    # Check which files are not in database or have no tags
-                    # and generate suggestions for each file
-                    from tag_suggestion import TagSuggester
-
+                    # Generate suggestions for each untagged file
                     tag_suggester = TagSuggester(self.config)
 
-                    untagged_files = {}
-                    for idx, file_path in enumerate(files):
-                        if self.stop_requested:
-                            return
+                    processed = total_files - len(pending)
+                    self.scan_progress.emit(processed, total_files)
 
-                        file_obj = (
-                            self.db_session.query(File)
-                            .filter_by(path=file_path)
-                            .first()
-                        )
-                        if not file_obj or not file_obj.tags:
-                            # Get tag suggestions for this specific file
-                            suggestions = tag_suggester.suggest_tags_for_file(file_path)
-                            untagged_files[file_path] = suggestions
+                    # A local model shares this machine's CPU, so analyze one file
+                    # at a time with it
+                    if self.config.get_selected_provider() == "local":
+                        max_workers = 1
+                    else:
+                        max_workers = SCAN_MAX_WORKERS
+
+                    # Get tag suggestions for several files at once; only the
+                    # file reads and AI requests run in parallel
+                    untagged_files = {}
+                    for file_path, suggestions in tag_suggester.suggest_tags_for_files(
+                        pending,
+                        db_session,
+                        max_workers=max_workers,
+                        should_stop=lambda: self.stop_requested,
+                    ):
+                        untagged_files[file_path] = suggestions
 
                         # Emit progress
-                        self.scan_progress.emit(idx + 1, total_files)
+                        processed += 1
+                        self.scan_progress.emit(processed, total_files)
+
+                    if self.stop_requested:
+                        return
+
+                    # Keep the directory order for the results list
+                    untagged_files = {
+                        path: untagged_files[path]
+                        for path in pending
+                        if path in untagged_files
+                    }
 
                     # Emit result with file-specific suggestions
                     self.scan_finished.emit(untagged_files)
 
                 except Exception as e:
                     self.scan_error.emit(str(e))
+                finally:
+                    db_session.close()
 
         # Create progress dialog
         progress = QProgressDialog(
@@ -1604,7 +2148,7 @@ class FileTagManager(QMainWindow):
         progress.setValue(0)
 
         # Create and configure scan thread
-        self.scan_thread = ScanThread(dir_path, self.db_session, self.config)
+        self.scan_thread = ScanThread(dir_path, self.config)
 
         # Connect signals
         self.scan_thread.scan_progress.connect(
@@ -1660,14 +2204,18 @@ class FileTagManager(QMainWindow):
         self.untagged_files_list = QListWidget()
         # Store file paths and their suggestions
         self.file_suggestions_map = untagged_files
+        # Checked file paths, kept up to date by on_untagged_file_changed
+        self._checked_untagged = {}
 
+        file_items = []
         for file_path in untagged_files.keys():
             item = QListWidgetItem(os.path.basename(file_path))
             item.setToolTip(file_path)
-            item.setFlags(item.flags() | Qt.ItemFlag.ItemIsUserCheckable)
             item.setCheckState(Qt.CheckState.Unchecked)
-            self.untagged_files_list.addItem(item)
+            file_items.append(item)
+        self.add_list_items(self.untagged_files_list, file_items)
 
+        self.untagged_files_list.itemChanged.connect(self.on_untagged_file_changed)
         file_layout.addWidget(self.untagged_files_list)
 
         # Selection buttons
@@ -1680,16 +2228,14 @@ class FileTagManager(QMainWindow):
 
         # Connect selection buttons
         select_all_btn.clicked.connect(
-            lambda: [
-                self.untagged_files_list.item(i).setCheckState(Qt.CheckState.Checked)
-                for i in range(self.untagged_files_list.count())
-            ]
+            lambda: self.set_all_check_states(
+                self.untagged_files_list, Qt.CheckState.Checked
+            )
         )
         select_none_btn.clicked.connect(
-            lambda: [
-                self.untagged_files_list.item(i).setCheckState(Qt.CheckState.Unchecked)
-                for i in range(self.untagged_files_list.count())
-            ]
+            lambda: self.set_all_check_states(
+                self.untagged_files_list, Qt.CheckState.Unchecked
+            )
         )
 
         main_layout.addLayout(file_layout)
@@ -1722,16 +2268,20 @@ class FileTagManager(QMainWindow):
         tag_list = QListWidget()
         tag_list.setSelectionMode(QListWidget.SelectionMode.ExtendedSelection)
 
-        # Add existing tags to the list
-        tags = self.db_session.query(Tag).all()
-        for tag in tags:
-            tag_color = QColor(tag.color)
-            text_color = Qt.white if is_dark_color(tag_color) else Qt.black
+        # Add existing tags to the list. Read plain name/color rows: the ORM
+        # objects cached by refresh_tags may have expired at a later commit,
+        # and reading them would reload each tag separately
+        tag_items = []
+        with self.db_session.no_autoflush:
+            tag_rows = self.db_session.query(Tag.name, Tag.color).all()
+        for tag_name, color in tag_rows:
+            tag_color, text_color = get_tag_colors(color)
 
-            tag_list.addItem(tag.name)
-            item = tag_list.item(tag_list.count() - 1)
+            item = QListWidgetItem(tag_name)
             item.setBackground(tag_color)
             item.setForeground(text_color)
+            tag_items.append(item)
+        self.add_list_items(tag_list, tag_items)
 
         tag_layout.addWidget(tag_list)
 
@@ -1760,7 +2310,7 @@ class FileTagManager(QMainWindow):
         # Connect buttons
         apply_selected_btn.clicked.connect(
             lambda: self.apply_tags_to_files(
-                self.get_selected_files_from_list(self.untagged_files_list),
+                list(self._checked_untagged),
                 [item.text() for item in tag_list.selectedItems()]
                 + [
                     self.get_tag_from_suggestion_item(item)
@@ -1770,9 +2320,7 @@ class FileTagManager(QMainWindow):
         )
 
         apply_all_suggestions_btn.clicked.connect(
-            lambda: self.apply_all_suggestions_to_files(
-                self.get_selected_files_from_list(self.untagged_files_list)
-            )
+            lambda: self.apply_all_suggestions_to_files(list(self._checked_untagged))
         )
 
         cancel_btn.clicked.connect(dialog.accept)
@@ -1808,6 +2356,7 @@ class FileTagManager(QMainWindow):
             )
 
             # Add suggestions to the list
+            items = []
             for tag_name, confidence in sorted_suggestions.items():
                 # Format item text with confidence
                 text = f"{tag_name} ({confidence:.2f})"
@@ -1819,8 +2368,8 @@ class FileTagManager(QMainWindow):
                 # Set background color based on confidence
                 item.setBackground(get_score_color(confidence))
 
-                # Add to list
-                self.file_suggestions_list.addItem(item)
+                items.append(item)
+            self.add_list_items(self.file_suggestions_list, items)
 
     def apply_all_suggestions_to_files(self, file_paths):
         """Apply all AI suggestions to the selected files."""
@@ -1831,20 +2380,54 @@ class FileTagManager(QMainWindow):
         applied_count = 0
         total_files = len(file_paths)
 
+        # Filter suggestions with good confidence (above 0.7)
+        good_suggestions = {}
         for file_path in file_paths:
-            if file_path in self.file_suggestions_map:
-                suggestions = self.file_suggestions_map[file_path]
+            suggestions = self.file_suggestions_map.get(file_path)
+            if suggestions:
+                tag_names = [tag for tag, score in suggestions.items() if score > 0.7]
+                if tag_names:
+                    good_suggestions[file_path] = tag_names
 
-                if suggestions:
-                    # Filter suggestions with good confidence (above 0.7)
-                    good_suggestions = {
-                        tag: score for tag, score in suggestions.items() if score > 0.7
-                    }
+        try:
+            # Create every new file record and tag up front in bulk statements
+            files_by_path = self._ensure_files(list(good_suggestions))
+            tags_by_name = self._ensure_tags(
+                tag for tag_names in good_suggestions.values() for tag in tag_names
+            )
+
+            # Every row is preloaded, so nothing in the loop needs the pending
+            # changes flushed; write them all in one flush at commit time
+            changed_paths = []
+            newly_tagged = set()
+            with self.db_session.no_autoflush:
+                for file_path, tag_names in good_suggestions.items():
+                    file_obj = files_by_path[file_path]
+                    tag_count = len(file_obj.tags)
+                    # Apply these tags
+                    if self.apply_tags_to_file(
+                        file_path, tag_names, files_by_path, tags_by_name
+                    ):
+                        newly_tagged.add(file_path)
+                    # Files that already had every suggested tag need no reindex
+                    if len(file_obj.tags) != tag_count:
+                        changed_paths.append(file_path)
+                    applied_count += 1
+
+            # Commit all changes at once
+            self.db_session.commit()
+        except Exception as e:
+            self.db_session.rollback()
+            self.logger.error(f"Error applying suggestions: {str(e)}")
+            QMessageBox.warning(self, "Error", f"Failed to apply suggestions: {str(e)}")
+            return
 
-                    if good_suggestions:
-                        # Apply these tags
-                        self.apply_tags_to_file(file_path, good_suggestions.keys())
-                        applied_count += 1
+        # Bring the search index in line with the committed tags in the background
+        for file_path in changed_paths:
+            self._queue_vector_update(file_path, file_path in newly_tagged)
+
+        # Refresh tag lists
+        self.refresh_tag_views()
 
         # Show success message
         if applied_count > 0:
@@ -1860,86 +2443,134 @@ class FileTagManager(QMainWindow):
                 "No high-confidence suggestions were found for the selected files.",
             )
 
-    def apply_tags_to_file(self, file_path, tag_names):
-        """Apply tags to a single file."""
+    def _ensure_tags(self, tag_names):
+        """Create any missing tags with bulk inserts and return all of them by name."""
+        tag_names = list(set(tag_names))
+        tags_by_name = {}
+        # Two bound values per inserted row, so halve the batch to stay under
+        # SQLite's variable limit
+        batch_size = PATH_QUERY_BATCH_SIZE // 2
+        for start in range(0, len(tag_names), batch_size):
+            batch = tag_names[start : start + batch_size]
+            self.db_session.execute(
+                sqlite_insert(Tag)
+                .values([{"name": name, "color": random_tag_color()} for name in batch])
+                .on_conflict_do_nothing(index_elements=["name"])
+            )
+            for tag in self.db_session.query(Tag).filter(Tag.name.in_(batch)):
+                tags_by_name[tag.name] = tag
+        return tags_by_name
+
+    def _ensure_files(self, paths):
+        """Create any missing file records with bulk inserts and return all by path."""
+        files_by_path = self._files_by_paths(paths)
+        missing = [path for path in dict.fromkeys(paths) if path not in files_by_path]
+        for start in range(0, len(missing), PATH_QUERY_BATCH_SIZE):
+            batch = missing[start : start + PATH_QUERY_BATCH_SIZE]
+            self.db_session.execute(
+                sqlite_insert(File)
+                .values([{"path": path} for path in batch])
+                .on_conflict_do_nothing(index_elements=["path"])
+            )
+        if missing:
+            # Read the new rows back to pick up their ids
+            files_by_path.update(self._files_by_paths(missing))
+        return files_by_path
+
+    def _files_by_paths(self, paths):
+        """Load the File rows for many paths, with their tags, keyed by path."""
+        paths = list(paths)
+        files_by_path = {}
+        for start in range(0, len(paths), PATH_QUERY_BATCH_SIZE):
+            batch = paths[start : start + PATH_QUERY_BATCH_SIZE]
+            for file_obj in (
+                self.db_session.query(File)
+                .options(selectinload(File.tags))
+                .filter(File.path.in_(batch))
+            ):
+                files_by_path[file_obj.path] = file_obj
+        return files_by_path
+
+    def apply_tags_to_file(
+        self,
+        file_path,
+        tag_names,
+        files_by_path=None,
+        tags_by_name=None,
+    ):
+        """Apply tags to a single file; returns True if it had no tags before."""
         if not tag_names:
-            return
+            return False
 
-        # Get or create file record
-        file_obj = self.db_session.query(File).filter_by(path=file_path).first()
+        # Get or create file record, using rows preloaded by _files_by_paths if given
+        if files_by_path is not None:
+            file_obj = files_by_path.get(file_path)
+        else:
+            file_obj = (
+                self.db_session.query(File)
+                .options(joinedload(File.tags))
+                .filter_by(path=file_path)
+                .first()
+            )
         is_new_file = False
 
         if not file_obj:
             file_obj = File(path=file_path)
             self.db_session.add(file_obj)
             is_new_file = True
+            if files_by_path is not None:
+                files_by_path[file_path] = file_obj
 
         # Check if file already had tags before
         had_tags_before = len(file_obj.tags) > 0
 
-        # Add tags (create them if they don't exist)
+        # Look up all the requested tags in one query, unless _ensure_tags
+        # already loaded them
+        if tags_by_name is None:
+            tags_by_name = {
+                tag.name: tag
+                for tag in self.db_session.query(Tag).filter(Tag.name.in_(tag_names))
+            }
+        existing_tags = set(file_obj.tags)
+
+        # Create the tags that don't exist yet, with random colors
+        new_tags = []
         for tag_name in tag_names:
-            tag = self.db_session.query(Tag).filter_by(name=tag_name).first()
-            if not tag:
-                # Create a new tag with a random color
-                import random
-
-                hue = random.randint(0, 359)
-                saturation = random.randint(128, 255)  # Medium to high saturation
-                value = random.randint(180, 255)  # Medium to high brightness
-                random_color = QColor.fromHsv(hue, saturation, value).name()
-
-                tag = Tag(name=tag_name, color=random_color)
-                self.db_session.add(tag)
-                self.db_session.flush()  # Generate ID without committing transaction
-
-            if tag not in file_obj.tags:
+            if tag_name not in tags_by_name:
+                tag = Tag(name=tag_name, color=random_tag_color())
+                tags_by_name[tag_name] = tag
+                new_tags.append(tag)
+        if new_tags:
+            self.db_session.add_all(new_tags)
+            self.db_session.flush()  # Generate IDs without committing transaction
+
+        # Add tags to the file
+        for tag_name in tag_names:
+            tag = tags_by_name[tag_name]
+            if tag not in existing_tags:
                 file_obj.tags.append(tag)
+                existing_tags.add(tag)
 
         # Don't commit here - we commit in the calling function
 
-        # If this is the first time the file has been tagged, add it to the vector database
-        if is_new_file or not had_tags_before:
-            try:
-                from vector_search.content_extractor import ContentExtractor
-
-                # Extract content from the file
-                print(f"Attempting to extract content from: {file_path}")
-                # Get the PDF extractor setting from config
-                pdf_extractor = self.config.get_pdf_extractor()
-                print(f"Using PDF extractor mode: {pdf_extractor}")
-                content = ContentExtractor.extract_file_content(
-                    file_path, pdf_extractor=pdf_extractor
-                )
-
-                if content:
-                    print(f"Content extracted, length: {len(content)} characters")
-                    # Add file to vector database
-                    print(f"Sending to vector search index: {file_path}")
-                    result = self.vector_search.index_file(file_path, content)
-                    print(
-                        f"Added newly tagged file to vector search index: {file_path}"
-                    )
-                else:
-                    print(
-                        f"Warning: No content could be extracted from file: {file_path}"
-                    )
-            except Exception as e:
-                import traceback
-
-                print(f"Error adding file to vector search: {str(e)}")
-                print("Detailed error information:")
-                traceback.print_exc()
-        else:
-            # If the file was already tagged before, just update the tags metadata
-            try:
-                self.vector_search.update_metadata(file_path)
-                print(f"Updated tags metadata for file in vector search: {file_path}")
-            except Exception as e:
-                import traceback
+        # The caller updates the search index once the tags are committed
+        return is_new_file or not had_tags_before
 
-                print(f"Error updating vector search metadata: {str(e)}")
-                traceback.print_exc()
+    def _queue_vector_update(self, file_path, newly_tagged):
+        """Update the search index for a tagged file on the background index thread."""
+        if self._deferred_index_updates is not None:
+            # A running reindex is replacing the collection; queue this afterwards
+            self._deferred_index_updates.append((file_path, newly_tagged))
+            return
+        if self._index_thread is None:
+            self._index_thread = VectorIndexThread(self.vector_search)
+            self._index_thread.index_progress.connect(
+                lambda message: self.statusBar().showMessage(message, 5000)
+            )
+            self._index_thread.start()
+        self._index_thread.enqueue(
+            file_path, newly_tagged, self.config.get_pdf_extractor()
+        )
 
     def apply_tags_to_files(self, file_paths, tag_names):
         """Apply selected tags to multiple files."""
@@ -1951,16 +2582,35 @@ class FileTagManager(QMainWindow):
             QMessageBox.warning(self, "Error", "Please select tags to apply!")
             return
 
-        # Apply tags to each file
-        for file_path in file_paths:
-            self.apply_tags_to_file(file_path, tag_names)
+        # A single file (the common case) skips the bulk preloading entirely
+        if len(file_paths) == 1:
+            changed_paths, newly_tagged = self._apply_tags_to_single_file(
+                file_paths[0], tag_names
+            )
+        else:
+            changed_paths, newly_tagged = self._link_tags_to_files(
+                file_paths, tag_names
+            )
+
+        if not changed_paths:
+            # Every file already has every tag; nothing to write or refresh
+            self.db_session.commit()
+            QMessageBox.information(
+                self,
+                "Tags Applied",
+                "The selected files already have all of the selected tags.",
+            )
+            return
 
         # Commit all changes at once
         self.db_session.commit()
 
+        # Bring the search index in line with the committed tags in the background
+        for file_path in changed_paths:
+            self._queue_vector_update(file_path, file_path in newly_tagged)
+
         # Refresh tag lists
-        self.refresh_tags()
-        self.refresh_file_tags()
+        self.refresh_tag_views()
 
         # Show success message
         QMessageBox.information(
@@ -1969,17 +2619,56 @@ class FileTagManager(QMainWindow):
             f"Applied {len(tag_names)} tag(s) to {len(file_paths)} file(s).",
         )
 
-    def get_selected_files_from_list(self, list_widget):
-        """Get file paths from checked items in a list widget."""
-        selected_files = []
+    def _apply_tags_to_single_file(self, file_path, tag_names):
+        """Tag one file; returns the changed paths and the newly tagged ones."""
+        file_obj = (
+            self.db_session.query(File)
+            .options(joinedload(File.tags))
+            .filter_by(path=file_path)
+            .first()
+        )
+        tag_count = len(file_obj.tags) if file_obj else 0
+        files_by_path = {file_path: file_obj}
+
+        newly_tagged = self.apply_tags_to_file(file_path, tag_names, files_by_path)
+        if file_obj and len(file_obj.tags) == tag_count:
+            return [], set()
+        return [file_path], {file_path} if newly_tagged else set()
+
+    def _link_tags_to_files(self, file_paths, tag_names):
+        """Tag many files in bulk; returns the changed paths and the newly tagged."""
+        # Load all the tag and file rows up front; suggested tags may not exist yet
+        tags = list(self._ensure_tags(tag_names).values())
+        files_by_path = self._ensure_files(file_paths)
+
+        # Collect the missing (file, tag) links and insert them in one executemany
+        rows = []
+        changed_paths = []
+        newly_tagged = set()
+        for file_path in file_paths:
+            file_obj = files_by_path[file_path]
+            existing_tags = set(file_obj.tags)
+            missing_tags = [tag for tag in tags if tag not in existing_tags]
+            if not missing_tags:
+                continue
+            changed_paths.append(file_path)
+            if not existing_tags:
+                newly_tagged.add(file_path)
+            rows.extend(
+                {"file_id": file_obj.id, "tag_id": tag.id} for tag in missing_tags
+            )
 
-        for i in range(list_widget.count()):
-            item = list_widget.item(i)
-            if item.checkState() == Qt.CheckState.Checked:
-                file_path = item.toolTip()
-                selected_files.append(file_path)
+        if rows:
+            self.db_session.execute(file_tags.insert(), rows)
+        return changed_paths, newly_tagged
 
-        return selected_files
+    def on_untagged_file_changed(self, item):
+        """Track which files are checked in the untagged files dialog."""
+        file_path = item.toolTip()
+        if item.checkState() == Qt.CheckState.Checked:
+            self._checked_untagged[file_path] = None
+        else:
+            self._checked_untagged.pop(file_path, None)
 
     def force_reindex_file(self, file_path):
         """Force a file to be reindexed in the vector search database."""
@@ -2028,11 +2717,9 @@ class FileTagManager(QMainWindow):
             except Exception as e:
                 print(f"Error checking AI configuration: {str(e)}")
 
-            from vector_search.content_extractor import ContentExtractor
-
-            # Create progress dialog for extraction
+            # Create progress dialog for extraction and indexing
             progress = QProgressDialog("Extracting content...", "Cancel", 0, 0, self)
-            progress.setWindowTitle("Extracting Content")
+            progress.setWindowTitle("Reindexing File")
             progress.setWindowModality(Qt.WindowModal)
             progress.setMinimumDuration(0)
             progress.setValue(0)
@@ -2042,107 +2729,39 @@ class FileTagManager(QMainWindow):
             progress.setRange(0, 0)  # Show busy indicator (spinner)
             progress.show()
 
-            # Variable to store extracted content
-            extracted_content = None
-
-            # Define callbacks for the async extraction
-            def on_progress(message):
-                progress.setLabelText(message)
-                QApplication.processEvents()
-
-            def on_extraction_complete(result):
-                nonlocal extracted_content
+            def on_reindex_finished(success, error):
                 progress.close()
-
-                if result.get("success", False):
-                    extracted_content = result.get("content", "")
-                    print(
-                        f"Content extraction completed successfully, length: {len(extracted_content)} characters"
-                    )
-                    finish_reindexing(extracted_content)
-                else:
-                    error = result.get("error", "Unknown error")
-                    print(f"Content extraction failed: {error}")
-                    QMessageBox.warning(
-                        self, "Error", f"Content extraction failed: {error}"
-                    )
-
-            def finish_reindexing(content):
-                if not content:
-                    QMessageBox.warning(
-                        self,
-                        "Error",
-                        f"Could not extract content from {os.path.basename(file_path)}.\n\n"
-                        "This file type may not be supported for content extraction.",
-                    )
-                    return False
-
-                try:
-                    # Remove existing entries before reindexing
-                    print(f"Removing existing document entries for: {file_path}")
-                    self.vector_search.remove_file(file_path)
-
-                    # Index the file with extracted content
-                    print(f"Reindexing file: {file_path}")
-                    self.vector_search.index_file(file_path, content)
-
-                    # Verify that the file was indexed with a summary
-                    try:
-                        results = self.vector_search.collection.get(
-                            ids=[file_path], include=["metadatas"]
-                        )
-                        if results and results["ids"] and len(results["ids"]) > 0:
-                            metadata = results["metadatas"][0]
-                            print(
-                                f"Verification successful - file found in vector store"
-                            )
-                            if "summary" in metadata and metadata["summary"]:
-                                print(
-                                    f"Document summary generated: {metadata['summary']}"
-                                )
-                            else:
-                                print("No document summary was generated")
-                    except Exception as verify_err:
-                        print(
-                            f"Error verifying file in vector store: {str(verify_err)}"
-                        )
-
+                if success:
                     QMessageBox.information(
                         self,
                         "Success",
                         f"The file {os.path.basename(file_path)} has been successfully reindexed.",
                     )
-                    return True
-                except Exception as e:
-                    print(f"Error during finishing reindexing: {str(e)}")
-                    traceback.print_exc()
-                    QMessageBox.warning(
-                        self, "Error", f"Failed to complete reindexing: {str(e)}"
-                    )
-                    return False
+                else:
+                    QMessageBox.warning(self, "Error", error)
 
             # Get the PDF extractor preference from config
             pdf_extractor = self.config.get_pdf_extractor()
             print(
-                f"Starting async content extraction from: {file_path} (using {pdf_extractor} extraction mode)"
+                f"Starting content extraction from: {file_path} (using {pdf_extractor} extraction mode)"
             )
 
-            # Start the async extraction process with the specified extractor mode
-            ContentExtractor.extract_file_content_async(
-                file_path,
-                on_extraction_complete,
-                on_progress,
-                pdf_extractor=pdf_extractor,
+            # Extract, summarize and index on a worker thread
+            reindex_thread = ForceReindexThread(
+                self.vector_search, file_path, pdf_extractor
             )
+            # Parent the thread so it outlives this method and cleans itself up
+            reindex_thread.setParent(self)
+            reindex_thread.finished.connect(reindex_thread.deleteLater)
+            reindex_thread.reindex_progress.connect(progress.setLabelText)
+            reindex_thread.reindex_finished.connect(on_reindex_finished)
+            reindex_thread.start()
             return (
                 True  # Return true immediately, the actual work happens asynchronously
             )
 
         except Exception as e:
-            print(f"Error during force reindex: {str(e)}")
-            import traceback
-
-            traceback.print_exc()
+            self.logger.exception("Error during force reindex: %s", e)
             QMessageBox.warning(self, "Error", f"Failed to reindex file: {str(e)}")
             return False
 
@@ -2178,8 +2797,7 @@ class FileTagManager(QMainWindow):
                 )
 
         except Exception as e:
-            self.logger.error(f"Error setting PDF extractor preference: {str(e)}")
-            self.logger.error(traceback.format_exc())
+            self.logger.exception("Error setting PDF extractor preference: %s", e)
             QMessageBox.warning(
                 self, "Error", f"Failed to change PDF extractor preference: {str(e)}"
             )
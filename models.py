@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine, Column, Integer, String, Table, ForeignKey, Float, JSON, DateTime
+from sqlalchemy import create_engine, event, Column, Integer, String, Table, ForeignKey, Float, JSON, DateTime, Text
 from sqlalchemy.orm import declarative_base, relationship, sessionmaker
 import datetime
 
@@ -8,8 +8,8 @@ Base = declarative_base()
 file_tags = Table(
     'file_tags',
     Base.metadata,
-    Column('file_id', Integer, ForeignKey('files.id')),
-    Column('tag_id', Integer, ForeignKey('tags.id'))
+    Column('file_id', Integer, ForeignKey('files.id'), index=True),
+    Column('tag_id', Integer, ForeignKey('tags.id'), index=True)
 )
 
 class File(Base):
@@ -37,7 +37,33 @@ class TagSuggestionCache(Base):
     suggestions = Column(JSON)  # Store suggestions with confidence scores
     provider = Column(String)  # Store which AI provider made these suggestions
 
+class ContentCache(Base):
+    __tablename__ = 'content_cache'
+
+    id = Column(Integer, primary_key=True)
+    file_path = Column(String, unique=True)
+    mtime = Column(Float)  # Modification time and size detect changed files
+    size = Column(Integer)
+    extractor = Column(String)  # PDF extractor mode the content was produced with
+    content = Column(Text)
+
+# One engine for the whole process; worker threads open their own short-lived
+# sessions from SessionLocal instead of creating engines of their own
+engine = create_engine('sqlite:///file_tags.db')
+
+@event.listens_for(engine, 'connect')
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    # WAL with NORMAL sync avoids a full fsync on every commit
+    cursor = dbapi_connection.cursor()
+    cursor.execute('PRAGMA journal_mode=WAL')
+    cursor.execute('PRAGMA synchronous=NORMAL')
+    cursor.close()
+
+SessionLocal = sessionmaker(bind=engine)
+
 def init_db():
-    engine = create_engine('sqlite:///file_tags.db')
     Base.metadata.create_all(engine)
-    return sessionmaker(bind=engine)()
\ No newline at end of file
+    # create_all skips tables that already exist, so add missing indexes to older databases
+    for index in file_tags.indexes:
+        index.create(engine, checkfirst=True)
+    return SessionLocal()
\ No newline at end of file
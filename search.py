@@ -88,7 +88,8 @@ def markdown_to_html(markdown_text):
 
 class ChatWithResultsDialog(QDialog):
     """Dialog for chatting with top search results using AI."""
-    def __init__(self, parent, ai_service, top_results, query):
+    def __init__(self, parent, ai_service, top_results, query, content_cache=None,
+                 pdf_extractor=None):
         super().__init__(parent)
         if ai_service is None:
             raise ValueError("AI service not initialized. Please check your API settings and try again.")
@@ -96,6 +97,10 @@ class ChatWithResultsDialog(QDialog):
         self.ai_service = ai_service
         self.top_results = top_results[:3] if len(top_results) >= 3 else top_results
         self.initial_query = query
+        # Optional (path, modification time, PDF extractor) -> text map of
+        # already extracted documents
+        self.content_cache = content_cache
+        self.pdf_extractor = pdf_extractor
         self.chat_history = []
         
         # Verify AI service is properly configured
@@ -171,7 +176,7 @@ class ChatWithResultsDialog(QDialog):
             
             # Get full document content instead of just snippets
             try:
-                full_content = ContentExtractor.extract_file_content(file_path)
+                full_content = self.get_document_content(file_path)
                 if full_content:
                     # Add the full content but include structural markers
                     context += f"Content:\n```\n{full_content}\n```\n\n"
@@ -209,6 +214,16 @@ class ChatWithResultsDialog(QDialog):
             self.chat_input.setPlainText(self.initial_query)
             self.send_message()
     
+    def get_document_content(self, file_path):
+        """Return a document's text, reusing a prefetched copy if it is current."""
+        if self.content_cache is not None:
+            key = (file_path, os.path.getmtime(file_path), self.pdf_extractor)
+            if key in self.content_cache:
+                return self.content_cache[key]
+        return ContentExtractor.extract_file_content(
+            file_path, pdf_extractor=self.pdf_extractor
+        )
+    
     def send_message(self):
         """Send the user message and get AI response."""
         user_message = self.chat_input.toPlainText().strip()
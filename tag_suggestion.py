@@ -3,13 +3,13 @@ from PySide6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QPushButton,
                             QListWidgetItem, QProgressBar, QWidget, QApplication,
                             QTextEdit)
 from PySide6.QtCore import Qt, QSize, QRandomGenerator, Signal, QEvent
-from PySide6.QtGui import QColor
 from sqlalchemy.orm import Session
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 from datetime import datetime
-import random
-from models import Tag, File, TagSuggestionCache
+from models import Tag, File, TagSuggestionCache, SessionLocal
 from ai_service import AIService
 from config import Config
+from utils import random_tag_color
 
 # Add TagSuggester class for batch processing of files
 class TagSuggester:
@@ -34,68 +34,149 @@ class TagSuggester:
         Returns:
             Dictionary mapping tag names to confidence scores
         """
+        # Create a session for the database operations
+        db_session = SessionLocal()
         try:
-            # Create a session for the database operations
-            from models import init_db
-            db_session = init_db()
-            
             # Get all existing tags
-            existing_tags = [tag.name for tag in db_session.query(Tag).all()]
-            
-            # Get provider and API key
-            provider = self.config.get_selected_provider()
-            api_key = self.config.get_api_key(provider)
-            
-            # Get custom system message
-            system_message = self.config.get_system_message()
-            
-            # Configure AI service based on provider
-            if provider == 'local':
-                local_model_path = self.config.get_local_model_path()
-                local_model_type = self.config.get_local_model_type()
-                
-                if not local_model_path:
-                    raise ValueError("No local model path configured")
-                
-                service = AIService(
-                    provider, 
-                    api_key="", 
-                    db_session=db_session,
-                    local_model_path=local_model_path,
-                    local_model_type=local_model_type,
-                    system_message=system_message
-                )
-            else:
-                if not api_key:
-                    raise ValueError(f"No API key configured for {provider}")
-                
-                service = AIService(
-                    provider, 
-                    api_key, 
-                    db_session=db_session,
-                    system_message=system_message
-                )
+            existing_tags = [name for (name,) in db_session.query(Tag.name)]
             
             # Analyze file
-            existing_matches, new_suggestions, _ = service.analyze_file(
-                file_path, 
-                existing_tags
+            service = self._create_service(db_session)
+            return self._combine_suggestions(
+                service.analyze_file(file_path, existing_tags)
             )
             
-            # Combine suggestions into a single dictionary
-            suggestions = {}
-            
-            for tag, confidence in existing_matches:
-                suggestions[tag] = confidence
-                
-            for tag, confidence in new_suggestions:
-                suggestions[tag] = confidence
-                
-            return suggestions
-            
         except Exception as e:
             print(f"Error suggesting tags for {file_path}: {str(e)}")
             return {}
+        finally:
+            db_session.close()
+    
+    def suggest_tags_for_files(self, file_paths, db_session, max_workers=1,
+                               should_stop=None):
+        """
+        Get AI tag suggestions for many files, analyzing several at once.
+        
+        Only reading the files and the AI requests run on the thread pool;
+        the suggestion cache is read and written through db_session on the
+        calling thread, so there is a single database writer.
+        
+        Args:
+            file_paths: Paths of the files to analyze
+            db_session: Database session owned by the calling thread
+            max_workers: Number of files analyzed at once
+            should_stop: Optional callable; stops early once it returns True
+            
+        Yields:
+            (file_path, suggestions) tuples in completion order
+        """
+        existing_tags = [name for (name,) in db_session.query(Tag.name)]
+        service = self._create_service(db_session)
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # file future -> (file_path, file hash once the file has been read)
+            futures = {}
+            remaining = iter(file_paths)
+            
+            def read_next_file():
+                file_path = next(remaining, None)
+                if file_path is not None:
+                    future = executor.submit(service.get_file_info, file_path)
+                    futures[future] = (file_path, None)
+            
+            # Read only a few files ahead, so AI requests don't queue behind
+            # the whole directory
+            for _ in range(max_workers):
+                read_next_file()
+            
+            while futures:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    file_path, file_hash = futures.pop(future)
+                    if should_stop and should_stop():
+                        for pending in futures:
+                            pending.cancel()
+                        return
+                    
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        print(f"Error suggesting tags for {file_path}: {str(e)}")
+                        if file_hash is None:
+                            read_next_file()
+                        yield file_path, {}
+                        continue
+                    
+                    if file_hash is None:
+                        # The file has been read; answer from the cache or
+                        # hand it to the AI service
+                        read_next_file()
+                        file_info, file_hash = result
+                        result = service.get_cached_suggestions(file_path, file_hash)
+                        if result is None:
+                            future = executor.submit(
+                                service.analyze_file_info, file_info, existing_tags
+                            )
+                            futures[future] = (file_path, file_hash)
+                            continue
+                    else:
+                        try:
+                            service.cache_suggestions(file_path, file_hash, result)
+                        except Exception as e:
+                            db_session.rollback()
+                            print(f"Error caching suggestions for {file_path}: {str(e)}")
+                    
+                    yield file_path, self._combine_suggestions(result)
+    
+    def _create_service(self, db_session) -> AIService:
+        """Create an AI service for the configured provider."""
+        # Get provider and API key
+        provider = self.config.get_selected_provider()
+        api_key = self.config.get_api_key(provider)
+        
+        # Get custom system message
+        system_message = self.config.get_system_message()
+        
+        # Configure AI service based on provider
+        if provider == 'local':
+            local_model_path = self.config.get_local_model_path()
+            local_model_type = self.config.get_local_model_type()
+            
+            if not local_model_path:
+                raise ValueError("No local model path configured")
+            
+            return AIService(
+                provider, 
+                api_key="", 
+                db_session=db_session,
+                local_model_path=local_model_path,
+                local_model_type=local_model_type,
+                system_message=system_message
+            )
+        
+        if not api_key:
+            raise ValueError(f"No API key configured for {provider}")
+        
+        return AIService(
+            provider, 
+            api_key, 
+            db_session=db_session,
+            system_message=system_message
+        )
+    
+    @staticmethod
+    def _combine_suggestions(result) -> dict:
+        """Combine existing and new tag matches into a single dictionary."""
+        existing_matches, new_suggestions, _ = result
+        suggestions = {}
+        
+        for tag, confidence in existing_matches:
+            suggestions[tag] = confidence
+            
+        for tag, confidence in new_suggestions:
+            suggestions[tag] = confidence
+            
+        return suggestions
         
 # Rest of the file remains unchanged
 class TagExplanationDialog(QDialog):
@@ -452,25 +533,33 @@ class TagSuggestionDialog(QDialog):
             # Track if file had tags before this operation
             had_tags_before = len(file_obj.tags) > 0
             
+            # Look up all the selected tags in one query
+            tags_by_name = {
+                tag.name: tag
+                for tag in self.db_session.query(Tag).filter(
+                    Tag.name.in_(selected_existing + selected_new)
+                )
+            }
+            file_tags = set(file_obj.tags)
+            
             # Add existing tags
             for tag_name in selected_existing:
-                tag = self.db_session.query(Tag).filter_by(name=tag_name).first()
-                if tag and tag not in file_obj.tags:
+                tag = tags_by_name.get(tag_name)
+                if tag and tag not in file_tags:
                     file_obj.tags.append(tag)
+                    file_tags.add(tag)
             
             # Create and add new tags with random colors
             for tag_name in selected_new:
-                tag = self.db_session.query(Tag).filter_by(name=tag_name).first()
+                tag = tags_by_name.get(tag_name)
                 if not tag:
                     # Generate random color with good saturation and brightness
-                    hue = random.randint(0, 359)
-                    saturation = random.randint(128, 255)  # Medium to high saturation
-                    value = random.randint(180, 255)  # Medium to high brightness
-                    random_color = QColor.fromHsv(hue, saturation, value).name()
-                    tag = Tag(name=tag_name, color=random_color)
+                    tag = Tag(name=tag_name, color=random_tag_color())
                     self.db_session.add(tag)
-                if tag not in file_obj.tags:
+                    tags_by_name[tag_name] = tag
+                if tag not in file_tags:
                     file_obj.tags.append(tag)
+                    file_tags.add(tag)
             
             # Commit changes to the database
             self.db_session.commit()
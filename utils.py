@@ -1,8 +1,11 @@
 from PySide6.QtGui import QColor
 from PySide6.QtCore import Qt
+import colorsys
 import os
+import random
 import subprocess
 import sys
+from functools import lru_cache
 
 def is_dark_color(color):
     """
@@ -18,16 +21,38 @@ def is_dark_color(color):
     # If luminance is less than 0.5, color is dark
     return luminance < 0.5
 
+@lru_cache(maxsize=512)
+def get_tag_colors(color: str):
+    """
+    Returns the (background, text) colors for a tag color string.
+    Results are cached per color string and shared, so callers must not modify them.
+    """
+    background = QColor(color)
+    return background, (Qt.white if is_dark_color(background) else Qt.black)
+
+def random_tag_color() -> str:
+    """Return a random '#rrggbb' color with medium to high saturation and brightness."""
+    red, green, blue = colorsys.hsv_to_rgb(
+        random.randint(0, 359) / 360,
+        random.randint(128, 255) / 255,  # Medium to high saturation
+        random.randint(180, 255) / 255,  # Medium to high brightness
+    )
+    return f"#{round(red * 255):02x}{round(green * 255):02x}{round(blue * 255):02x}"
+
+# Score colors are shared; callers must copy before modifying them
+_SCORE_COLORS = (
+    (0.8, QColor(200, 255, 200)),  # Light green
+    (0.6, QColor(255, 255, 200)),  # Light yellow
+    (0.4, QColor(255, 230, 200)),  # Light orange
+)
+_LOW_SCORE_COLOR = QColor(255, 200, 200)  # Light red
+
 def get_score_color(score: float) -> QColor:
     """Get a color representing the match score (red to green)."""
-    if score >= 0.8:
-        return QColor(200, 255, 200)  # Light green
-    elif score >= 0.6:
-        return QColor(255, 255, 200)  # Light yellow
-    elif score >= 0.4:
-        return QColor(255, 230, 200)  # Light orange
-    else:
-        return QColor(255, 200, 200)  # Light red
+    for threshold, color in _SCORE_COLORS:
+        if score >= threshold:
+            return color
+    return _LOW_SCORE_COLOR
 
 def open_file(file_path: str):
     """Open a file with the system's default application."""
@@ -55,4 +80,25 @@ def open_containing_folder(file_path: str):
                 # On Linux, just open the containing directory
                 subprocess.call(['xdg-open', dir_path])
         except Exception as e:
-            raise Exception(f"Could not open containing folder: {str(e)}")
\ No newline at end of file
+            raise Exception(f"Could not open containing folder: {str(e)}")
+
+
+def existing_paths(paths) -> set:
+    """Return the subset of paths that exist, listing each directory once."""
+    by_dir = {}
+    for path in paths:
+        by_dir.setdefault(os.path.dirname(path), []).append(path)
+
+    found = set()
+    for dir_path, dir_paths in by_dir.items():
+        try:
+            with os.scandir(dir_path or os.curdir) as entries:
+                names = {os.path.normcase(entry.name) for entry in entries}
+        except OSError:
+            # Fall back to individual checks if the directory can't be listed
+            found.update(p for p in dir_paths if os.path.exists(p))
+            continue
+        found.update(
+            p for p in dir_paths if os.path.normcase(os.path.basename(p)) in names
+        )
+    return found
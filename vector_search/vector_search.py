@@ -3,11 +3,17 @@ Main module for vector search functionality.
 Provides vector database management for semantic search of file contents.
 """
 
+import copy
 import importlib
 import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 import chromadb
+import numpy as np
 from chromadb.utils.embedding_functions import SentenceTransformerEmbeddingFunction
-from typing import List, Dict, Optional, Any, Tuple
+from typing import List, Dict, Optional, Any, Tuple, Callable, Iterator
 from datetime import datetime
 import json
 import traceback
@@ -17,6 +23,20 @@ from .content_extractor import ContentExtractor
 from .search_utils import SearchUtils
 from ai_service import AIService
 from config import Config
+from models import ContentCache, File
+
+# Query cache settings: maximum number of cached queries and entry lifetime.
+# Only queries that are equal after folding case and whitespace share results;
+# e5 embeddings of distinct short queries are too close to tell apart safely.
+QUERY_CACHE_SIZE = 256
+QUERY_CACHE_TTL = 300  # seconds
+
+# Maximum number of entries (documents and chunks) sent in one collection.add call
+INDEX_BATCH_SIZE = 100
+
+# Files extracted at once when reindexing; extractors such as docling
+# already use several threads each
+EXTRACT_MAX_WORKERS = min(4, os.cpu_count() or 1)
 
 
 class VectorSearch:
@@ -34,6 +54,9 @@ class VectorSearch:
         self.db_session = db_session
         self.config = config  # Store the config object
         self.collection_name = collection_name
+        # (normalized query, filter key) -> (results, timestamp)
+        self._query_cache = OrderedDict()
+        self._query_cache_lock = threading.Lock()
         print("\nInitializing vector search...")
 
         try:
@@ -71,6 +94,21 @@ class VectorSearch:
             # Create a placeholder collection to prevent errors
             self.collection = None
 
+    def with_session(self, db_session) -> "VectorSearch":
+        """
+        Return a copy of this instance that uses another database session.
+
+        The copy shares the ChromaDB client, collection and query cache, so it
+        is cheap; it lets a worker thread index files without touching the
+        session the UI is using.
+
+        Args:
+            db_session: SQLAlchemy database session for the copy
+        """
+        clone = copy.copy(self)
+        clone.db_session = db_session
+        return clone
+
     def index_file(self, file_path: str, content: str, metadata: Optional[Dict] = None):
         """
         Index a file's content in the vector database using chunking strategy.
@@ -85,7 +123,192 @@ class VectorSearch:
             return
 
         print(f"Indexing file: {file_path}")
+        self.clear_query_cache()
+
+        # Check if we already have this file indexed
+        try:
+            existing_docs = self.collection.get(ids=[file_path], include=["metadatas"])
+
+            if existing_docs and existing_docs["ids"] and len(existing_docs["ids"]) > 0:
+                # Delete existing document and its chunks
+                self.remove_file(file_path)
+        except Exception as e:
+            print(f"Error checking document existence: {str(e)}")
+
+        ids, metadatas, documents = self._prepare_index_entries(
+            file_path, content, metadata
+        )
+
+        # Add the document and all of its chunks in a single call
+        try:
+            self._add_index_entries(ids, metadatas, documents)
+            print(f"Successfully indexed {len(ids)} entries for {file_path}")
+        except Exception as e:
+            print(f"Error indexing {file_path}: {str(e)}")
+            traceback.print_exc()
+
+    def extract_content(
+        self, file_path: str, pdf_extractor: Optional[str] = None
+    ) -> Optional[str]:
+        """
+        Extract a file's content, reusing the cached text if the file is unchanged.
+
+        Cached entries are matched on modification time, size and extractor mode.
+        New entries are added to the session and saved with the caller's commit.
+
+        Args:
+            file_path: Path to the file
+            pdf_extractor: Optional extraction method override ('fast' or 'accurate')
+
+        Returns:
+            Extracted text content, or None if nothing could be extracted
+        """
+        if pdf_extractor is None:
+            pdf_extractor = self.get_pdf_extractor_preference()
+
+        try:
+            file_stat, cache_entry, content = self._lookup_cached_content(
+                file_path, pdf_extractor
+            )
+        except Exception as e:
+            print(f"Error checking content cache for {file_path}: {str(e)}")
+            return ContentExtractor.extract_file_content(
+                file_path, pdf_extractor=pdf_extractor
+            )
 
+        if content is not None:
+            return content
+
+        content = ContentExtractor.extract_file_content(
+            file_path, pdf_extractor=pdf_extractor
+        )
+        self._store_cached_content(
+            file_path, file_stat, cache_entry, pdf_extractor, content
+        )
+        return content
+
+    def iter_contents(
+        self,
+        file_paths: List[str],
+        pdf_extractor: Optional[str] = None,
+        max_workers: int = EXTRACT_MAX_WORKERS,
+    ) -> Iterator[Tuple[str, Optional[str]]]:
+        """
+        Yield the content of many files in order, extracting uncached ones in parallel.
+
+        Cache lookups and updates stay on the calling thread; only the
+        extraction itself runs on the thread pool, a few files ahead of
+        the consumer.
+
+        Args:
+            file_paths: Paths of the files to extract
+            pdf_extractor: Optional extraction method override ('fast' or 'accurate')
+            max_workers: Number of files extracted at once
+
+        Yields:
+            (file_path, content) tuples; content is None for missing files
+        """
+        if pdf_extractor is None:
+            pdf_extractor = self.get_pdf_extractor_preference()
+
+        window = max_workers * 2
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        jobs = []
+        try:
+            for start in range(0, len(file_paths), window):
+                # Look up the cache for this window and start extracting the misses
+                jobs = []
+                for file_path in file_paths[start : start + window]:
+                    # The cache lookup's stat doubles as the existence check
+                    try:
+                        file_stat, cache_entry, content = self._lookup_cached_content(
+                            file_path, pdf_extractor
+                        )
+                    except (FileNotFoundError, NotADirectoryError):
+                        jobs.append((file_path, None, None, None, None))
+                        continue
+                    except Exception as e:
+                        print(f"Error checking content cache for {file_path}: {str(e)}")
+                        file_stat, cache_entry, content = None, None, None
+                    future = None
+                    if content is None:
+                        future = executor.submit(
+                            ContentExtractor.extract_file_content,
+                            file_path,
+                            pdf_extractor=pdf_extractor,
+                        )
+                    jobs.append((file_path, file_stat, cache_entry, content, future))
+
+                for file_path, file_stat, cache_entry, content, future in jobs:
+                    if future is not None:
+                        try:
+                            content = future.result()
+                        except Exception as e:
+                            print(f"Error extracting {file_path}: {str(e)}")
+                            content = None
+                        if file_stat is not None:
+                            self._store_cached_content(
+                                file_path,
+                                file_stat,
+                                cache_entry,
+                                pdf_extractor,
+                                content,
+                            )
+                    yield file_path, content
+        finally:
+            # Drop queued extractions if the consumer stops early; cancel them
+            # by hand, as shutdown() only takes cancel_futures from Python 3.9
+            for job in jobs:
+                if job[4] is not None:
+                    job[4].cancel()
+            executor.shutdown(wait=False)
+
+    def _lookup_cached_content(self, file_path: str, pdf_extractor: str):
+        """Return (stat, cache entry, cached content or None) for a file."""
+        file_stat = os.stat(file_path)
+        cache_entry = (
+            self.db_session.query(ContentCache).filter_by(file_path=file_path).first()
+        )
+        if (
+            cache_entry
+            and cache_entry.mtime == file_stat.st_mtime
+            and cache_entry.size == file_stat.st_size
+            and cache_entry.extractor == pdf_extractor
+        ):
+            print(f"Using cached content for {file_path}")
+            return file_stat, cache_entry, cache_entry.content
+        return file_stat, cache_entry, None
+
+    def _store_cached_content(
+        self, file_path: str, file_stat, cache_entry, pdf_extractor: str, content
+    ):
+        """Save freshly extracted content in the content cache."""
+        # Don't cache failures, so the next attempt extracts again
+        if not content or content.startswith("Error extracting content:"):
+            return
+
+        if not cache_entry:
+            cache_entry = ContentCache(file_path=file_path)
+            self.db_session.add(cache_entry)
+        cache_entry.mtime = file_stat.st_mtime
+        cache_entry.size = file_stat.st_size
+        cache_entry.extractor = pdf_extractor
+        cache_entry.content = content
+
+    def _prepare_index_entries(
+        self, file_path: str, content: str, metadata: Optional[Dict] = None
+    ) -> Tuple[List[str], List[Dict], List[str]]:
+        """
+        Build the ids, metadata and documents that index a file.
+
+        Args:
+            file_path: Path to the file
+            content: Text content of the file
+            metadata: Optional additional metadata
+
+        Returns:
+            Tuple of (ids, metadatas, documents) ready for collection.add
+        """
         if not metadata:
             metadata = {}
 
@@ -104,8 +327,6 @@ class VectorSearch:
             metadata["summary"] = summary
 
         # Add file's current tags
-        from models import File
-
         file_obj = self.db_session.query(File).filter_by(path=file_path).first()
         if file_obj:
             # Convert tags list to a string that ChromaDB can handle
@@ -116,16 +337,6 @@ class VectorSearch:
         else:
             metadata["tags"] = "[]"  # Empty JSON array as string
 
-        # Check if we already have this file indexed
-        try:
-            existing_docs = self.collection.get(ids=[file_path], include=["metadatas"])
-
-            if existing_docs and existing_docs["ids"] and len(existing_docs["ids"]) > 0:
-                # Delete existing document and its chunks
-                self.remove_file(file_path)
-        except Exception as e:
-            print(f"Error checking document existence: {str(e)}")
-
         # Chunk the document for better semantic search
         chunks = DocumentChunker.chunk_document(content)
         num_chunks = len(chunks)
@@ -134,66 +345,59 @@ class VectorSearch:
 
         # If document is small, just index as a single chunk
         if num_chunks <= 1:
-            try:
-                # Add as a single document
-                self.collection.add(
-                    ids=[file_path], metadatas=[metadata], documents=[content]
-                )
-                print("Indexed as single document")
-            except Exception as e:
-                print(f"Error indexing {file_path}: {str(e)}")
-                traceback.print_exc()
-            return
+            return [file_path], [metadata], [content]
+
+        ids, metadatas, documents = [], [], []
 
         # For chunked documents, add each chunk with chunk-specific metadata
-        try:
-            for i, chunk in enumerate(chunks):
-                # Create chunk-specific metadata and ID
-                chunk_metadata = metadata.copy()
-                chunk_metadata.update(
-                    {
-                        "chunk_id": i,
-                        "chunk_total": num_chunks,
-                        "chunk_title": DocumentChunker.extract_chunk_title(chunk),
-                        "is_chunk": True,
-                    }
-                )
+        for i, chunk in enumerate(chunks):
+            # Create chunk-specific metadata and ID
+            chunk_metadata = metadata.copy()
+            chunk_metadata.update(
+                {
+                    "chunk_id": i,
+                    "chunk_total": num_chunks,
+                    "chunk_title": DocumentChunker.extract_chunk_title(chunk),
+                    "is_chunk": True,
+                }
+            )
 
-                # Create a compound ID to allow retrieving specific chunks
-                chunk_id = f"{file_path}#chunk{i}"
+            # Create a compound ID to allow retrieving specific chunks
+            ids.append(f"{file_path}#chunk{i}")
+            metadatas.append(chunk_metadata)
+            documents.append(chunk)
 
-                # Index this chunk
-                self.collection.add(
-                    ids=[chunk_id], metadatas=[chunk_metadata], documents=[chunk]
-                )
+        # Also add the full document as a single entry for simple retrieval
+        # and to ensure we can find it by file path ID
+        full_metadata = metadata.copy()
+        full_metadata.update(
+            {"has_chunks": True, "num_chunks": num_chunks, "is_chunk": False}
+        )
 
-            # Also add the full document as a single entry for simple retrieval
-            # and to ensure we can find it by file path ID
-            full_metadata = metadata.copy()
-            full_metadata.update(
-                {"has_chunks": True, "num_chunks": num_chunks, "is_chunk": False}
-            )
+        # Add a shortened version of the full content
+        summary_length = min(1500, len(content))
+        summary_content = content[:summary_length] + (
+            "..." if len(content) > summary_length else ""
+        )
 
-            # Add a shortened version of the full content
-            summary_length = min(1500, len(content))
-            summary_content = content[:summary_length] + (
-                "..." if len(content) > summary_length else ""
-            )
+        ids.append(file_path)
+        metadatas.append(full_metadata)
+        documents.append(summary_content)  # Store a summarized version of the full content
 
+        return ids, metadatas, documents
+
+    def _add_index_entries(
+        self, ids: List[str], metadatas: List[Dict], documents: List[str]
+    ):
+        """Add entries to the collection, at most INDEX_BATCH_SIZE per call."""
+        for start in range(0, len(ids), INDEX_BATCH_SIZE):
+            end = start + INDEX_BATCH_SIZE
             self.collection.add(
-                ids=[file_path],
-                metadatas=[full_metadata],
-                documents=[
-                    summary_content
-                ],  # Store a summarized version of the full content
+                ids=ids[start:end],
+                metadatas=metadatas[start:end],
+                documents=documents[start:end],
             )
 
-            print(f"Successfully indexed {num_chunks} chunks for {file_path}")
-
-        except Exception as e:
-            print(f"Error indexing chunks for {file_path}: {str(e)}")
-            traceback.print_exc()
-
     def update_metadata(self, file_path: str):
         """
         Update metadata for an existing document.
@@ -210,8 +414,6 @@ class VectorSearch:
 
         try:
             # Get file from database
-            from models import File
-
             file_obj = self.db_session.query(File).filter_by(path=file_path).first()
             if not file_obj:
                 print(f"File not found in database: {file_path}")
@@ -247,24 +449,26 @@ class VectorSearch:
                     metadata["summary"] = existing_summary
 
             if existing_docs and existing_docs["ids"] and len(existing_docs["ids"]) > 0:
-                # If we don't have an existing summary, try to generate one                if not existing_summary and os.path.exists(file_path):
-                try:
-                    from .content_extractor import ContentExtractor
-
-                    # Use the configured PDF extractor preference
-                    pdf_extractor = self.get_pdf_extractor_preference()
-                    content = ContentExtractor.extract_file_content(
-                        file_path, pdf_extractor=pdf_extractor
-                    )
-                    if content:
-                        summary = self.generate_document_summary(file_path, content)
-                        if summary:
-                            metadata["summary"] = summary
-                except Exception as e:
-                    print(f"Error generating summary during metadata update: {str(e)}")
+                # If we don't have an existing summary, try to generate one
+                if not existing_summary and os.path.exists(file_path):
+                    try:
+                        # Use the configured PDF extractor preference
+                        pdf_extractor = self.get_pdf_extractor_preference()
+                        content = self.extract_content(file_path, pdf_extractor)
+                        # Commit the cached content before the slow summary call
+                        self.db_session.commit()
+                        if content:
+                            summary = self.generate_document_summary(file_path, content)
+                            if summary:
+                                metadata["summary"] = summary
+                    except Exception as e:
+                        print(
+                            f"Error generating summary during metadata update: {str(e)}"
+                        )
 
                 # Update document metadata
                 self.collection.update(ids=[file_path], metadatas=[metadata])
+                self.clear_query_cache()
                 print(f"Updated metadata for {file_path}")
                 return True
             else:
@@ -342,6 +546,27 @@ class VectorSearch:
         print(f"\nSearching with query: {query}")
         print(f"Tag filter: {tag_filter}, use_and: {use_and}")
 
+        # A repeated query is answered without embedding it again
+        cache_key = (
+            " ".join(query.lower().split()),
+            tuple(sorted(tag_filter or [])),
+            use_and,
+            limit,
+        )
+        cached_results = self._get_cached_results(cache_key)
+        if cached_results is not None:
+            print("Returning cached results for a repeated query")
+            return cached_results
+
+        # Enhance query by using query expansion, and embed all variants at once
+        expanded_queries = SearchUtils.expand_query(query)
+        try:
+            query_embeddings = self._embed_queries(expanded_queries)
+        except Exception as embed_err:
+            print(f"Error embedding query: {str(embed_err)}")
+            traceback.print_exc()
+            return []
+
         # Debug: Check collection health
         try:
             print("\nDebug: Collection health check")
@@ -372,28 +597,16 @@ class VectorSearch:
         try:
             print(f"Executing query: '{query}' with limit={limit}")
 
-            # Enhance query by using query expansion and improved parameters
-            expanded_queries = SearchUtils.expand_query(query)
-
             # Get potentially matching chunks - include document contents for search
             try:
                 # Use multiple queries for better recall if we have expansions
-                if expanded_queries:
-                    results = self.collection.query(
-                        query_texts=expanded_queries,
-                        n_results=(
-                            100 if tag_filter else limit * 3
-                        ),  # Get more results for filtering and chunked docs
-                        include=["metadatas", "distances"],
-                    )
-                else:
-                    results = self.collection.query(
-                        query_texts=[query],
-                        n_results=(
-                            100 if tag_filter else limit * 3
-                        ),  # Get more results for filtering and chunked docs
-                        include=["metadatas", "distances"],
-                    )
+                results = self.collection.query(
+                    query_embeddings=query_embeddings.tolist(),
+                    n_results=(
+                        100 if tag_filter else limit * 3
+                    ),  # Get more results for filtering and chunked docs
+                    include=["metadatas", "distances"],
+                )
             except Exception as query_err:
                 print(f"Error during query: {str(query_err)}")
                 traceback.print_exc()
@@ -561,25 +774,72 @@ class VectorSearch:
                     seen_paths.add(result["path"])
                     unique_results.append(result)
 
-            return unique_results[:limit]
+            final_results = unique_results[:limit]
+            self._store_cached_results(cache_key, final_results)
+            return final_results
 
         except Exception as e:
             print(f"Search error: {str(e)}")
             traceback.print_exc()
             return []
 
-    def reindex_all(self, progress_callback=None):
+    def _embed_queries(self, queries: List[str]) -> np.ndarray:
+        """Embed query strings with the collection's embedding function."""
+        return np.asarray(self.embedding_function(queries), dtype=np.float32)
+
+    def _get_cached_results(self, cache_key: Tuple) -> Optional[List[Dict]]:
+        """
+        Look up results of an earlier, identical query.
+
+        Args:
+            cache_key: Normalized query, tag filter, AND/OR mode and limit
+
+        Returns:
+            Copies of the cached results, or None on a cache miss
+        """
+        with self._query_cache_lock:
+            entry = self._query_cache.get(cache_key)
+            if entry is None:
+                return None
+            results, timestamp = entry
+            if time.monotonic() - timestamp > QUERY_CACHE_TTL:
+                del self._query_cache[cache_key]
+                return None
+            self._query_cache.move_to_end(cache_key)
+            return [dict(result) for result in results]
+
+    def _store_cached_results(self, cache_key: Tuple, results: List[Dict]):
+        """Remember search results, evicting the least recently used entries."""
+        with self._query_cache_lock:
+            self._query_cache[cache_key] = (
+                [dict(result) for result in results],
+                time.monotonic(),
+            )
+            self._query_cache.move_to_end(cache_key)
+            while len(self._query_cache) > QUERY_CACHE_SIZE:
+                self._query_cache.popitem(last=False)
+
+    def clear_query_cache(self):
+        """Forget cached search results, e.g. after the index changes."""
+        with self._query_cache_lock:
+            self._query_cache.clear()
+
+    def reindex_all(
+        self, progress_callback=None, should_stop: Optional[Callable[[], bool]] = None
+    ):
         """
         Reindex all files in the database.
 
         Args:
             progress_callback: Optional callback function for progress updates
+            should_stop: Optional callable; reindexing stops early once it returns True
         """
         if self.collection is None:
             if progress_callback:
                 progress_callback("Vector database not initialized properly", 0)
             return
 
+        self.clear_query_cache()
         try:
             # Try to delete the collection and recreate it
             try:
@@ -602,38 +862,75 @@ class VectorSearch:
                     print(f"Error clearing collection: {str(e2)}")
 
             # Get all files from database
-            from models import File
-
             files = self.db_session.query(File).all()
             total_files = len(files)
 
             if progress_callback:
                 progress_callback(f"Reindexing {total_files} files", 5)
 
+            # Entries from several files are sent to the collection together
+            pending_ids, pending_metadatas, pending_documents = [], [], []
+
+            def flush_pending():
+                try:
+                    self._add_index_entries(
+                        pending_ids, pending_metadatas, pending_documents
+                    )
+                except Exception as e:
+                    print(f"Error adding batch to collection: {str(e)}")
+                    traceback.print_exc()
+                pending_ids.clear()
+                pending_metadatas.clear()
+                pending_documents.clear()
+
+            # Extract several files at once, ahead of summarizing and indexing
+            pdf_extractor = self.get_pdf_extractor_preference()
+            print(f"Reindexing using {pdf_extractor} extraction mode")
+            contents = self.iter_contents(
+                [file_obj.path for file_obj in files], pdf_extractor
+            )
+
             indexed = 0
-            for i, file_obj in enumerate(files):
+            for i, (file_path, content) in enumerate(contents):
+                if should_stop and should_stop():
+                    contents.close()
+                    flush_pending()
+                    self.db_session.commit()  # Keep the extracted content cached
+                    if progress_callback:
+                        progress_callback(
+                            f"Reindexing stopped after {indexed}/{total_files} files",
+                            100,
+                        )
+                    return
+
+                # Commit newly cached content before summarizing, so the write
+                # lock is not held while the AI service and embedding run
+                if self.db_session.new or self.db_session.dirty:
+                    self.db_session.commit()
+
                 if progress_callback:
                     progress = 5 + int((i / total_files) * 90)  # 5-95% for indexing
                     progress_callback(
-                        f"Indexing {i+1}/{total_files}: {file_obj.path}", progress
+                        f"Indexing {i+1}/{total_files}: {file_path}", progress
                     )
-                    try:
-                        if os.path.exists(file_obj.path):
-                            # Get the PDF extractor preference
-                            pdf_extractor = self.get_pdf_extractor_preference()
+                try:
+                    if content:
+                        # The collection was just emptied, so there is
+                        # nothing to remove first
+                        ids, metadatas, documents = self._prepare_index_entries(
+                            file_path, content
+                        )
+                        pending_ids.extend(ids)
+                        pending_metadatas.extend(metadatas)
+                        pending_documents.extend(documents)
+                        indexed += 1
+                        if len(pending_ids) >= INDEX_BATCH_SIZE:
+                            flush_pending()
+                except Exception as e:
+                    print(f"Error indexing {file_path}: {str(e)}")
 
-                            print(
-                                f"Reindexing {file_obj.path} using {pdf_extractor} extraction mode"
-                            )
-                            # Get file content
-                            content = ContentExtractor.extract_file_content(
-                                file_obj.path, pdf_extractor=pdf_extractor
-                            )
-                            if content:
-                                self.index_file(file_obj.path, content)
-                                indexed += 1
-                    except Exception as e:
-                        print(f"Error indexing {file_obj.path}: {str(e)}")
+            flush_pending()
+            self.db_session.commit()  # Keep the extracted content cached
 
             if progress_callback:
                 progress_callback(
@@ -673,8 +970,6 @@ class VectorSearch:
         print(f"\nChecking specific file: {file_path}")
 
         # Check if file exists in database
-        from models import File
-
         file_obj = self.db_session.query(File).filter_by(path=file_path).first()
         if file_obj:
             print("File found in database")
@@ -739,6 +1034,7 @@ class VectorSearch:
             print("Vector database not initialized properly")
             return False
 
+        self.clear_query_cache()
         try:
             # First, check for any chunks associated with this file
             try: